@@ -1,12 +1,12 @@
 import pandas as pd
 from statsmodels.tsa.arima.model import ARIMA
 
-def fit_arima(series, order):
+def fit_arima(series, order, start_params=None):
     if not isinstance(series, pd.Series):
         raise TypeError("Input must be a pandas Series")
     s = series.dropna().astype(float)
     model = ARIMA(s, order=order)
-    res = model.fit()
+    res = model.fit(start_params=start_params)
     return res
 
 def forecast(model_result, steps):
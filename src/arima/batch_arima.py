@@ -0,0 +1,97 @@
+import itertools
+import signal
+import threading
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+import numpy as np
+
+from src.arima.arima_model import fit_arima, arima_diagnostics
+
+CRITERIA = ("aic", "bic", "hqic")
+
+
+def order_grid(p_values, d_values, q_values):
+    return list(itertools.product(p_values, d_values, q_values))
+
+
+def _on_alarm(signum, frame):
+    raise TimeoutError("ARIMA fit timed out")
+
+
+def _fit_with_timeout(series, order, timeout):
+    use_alarm = timeout is not None and hasattr(signal, "SIGALRM") and threading.current_thread() is threading.main_thread()
+    if not use_alarm:
+        return fit_arima(series, order)
+    previous = signal.signal(signal.SIGALRM, _on_alarm)
+    signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        return fit_arima(series, order)
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def _empty_fit(name, order, error=None):
+    return {"series": name, "order": order, "aic": np.nan, "bic": np.nan, "hqic": np.nan, "params": None, "error": error}
+
+
+def _fit_series(name, series, orders, timeout):
+    fits = []
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        for order in orders:
+            row = _empty_fit(name, tuple(order))
+            try:
+                res = _fit_with_timeout(series, tuple(order), timeout)
+                d = arima_diagnostics(res)
+                row.update({k: float(d[k]) for k in CRITERIA})
+                row["params"] = res.params.to_dict()
+            except Exception as e:
+                row["error"] = f"{type(e).__name__}: {e}"
+            fits.append(row)
+    return fits
+
+
+def _select_best(name, fits, criterion):
+    ok = [f for f in fits if f["error"] is None and np.isfinite(f[criterion])]
+    if not ok:
+        errors = "; ".join(f"{f['order']}: {f['error']}" for f in fits if f["error"])
+        out = _empty_fit(name, None, errors or "no valid fit")
+        out["n_failed"] = len(fits)
+        return out
+    best = min(ok, key=lambda f: f[criterion])
+    out = {k: best[k] for k in ("series", "order", "aic", "bic", "hqic", "params")}
+    out["n_failed"] = len(fits) - len(ok)
+    out["error"] = None
+    return out
+
+
+def batch_fit_arima(data, orders, criterion="aic", n_jobs=None, timeout=None, return_all=False):
+    if not isinstance(data, pd.DataFrame):
+        raise TypeError("Input must be a pandas DataFrame")
+    if criterion not in CRITERIA:
+        raise ValueError(f"criterion must be one of {CRITERIA}")
+    orders = [tuple(o) for o in orders]
+    if not orders:
+        raise ValueError("orders must not be empty")
+    tasks = [(name, data[name].dropna().astype(float)) for name in data.columns]
+    results = {}
+    if n_jobs == 1:
+        for name, s in tasks:
+            results[name] = _fit_series(name, s, orders, timeout)
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs) as ex:
+            futures = {name: ex.submit(_fit_series, name, s, orders, timeout) for name, s in tasks}
+            for name, fut in futures.items():
+                try:
+                    results[name] = fut.result()
+                except Exception as e:
+                    err = f"{type(e).__name__}: {e}"
+                    results[name] = [_empty_fit(name, o, err) for o in orders]
+    best = pd.DataFrame([_select_best(name, results[name], criterion) for name, _ in tasks]).set_index("series")
+    if not return_all:
+        return best
+    fits = pd.DataFrame([f for name, _ in tasks for f in results[name]])
+    return best, fits
@@ -0,0 +1,80 @@
+import numpy as np
+from scipy.stats import norm
+
+
+def arima_state(model_result):
+    fr = model_result.filter_results
+    model = model_result.model
+    n = int(model_result.nobs)
+    obs_intercept = np.asarray(fr.obs_intercept, dtype=float)
+    if obs_intercept.shape[-1] > 1:
+        if getattr(model, "trend", None) != "c" or getattr(model, "k_exog", 0) != 0:
+            raise ValueError("only constant-mean trends can be forecast without statsmodels")
+        intercept = float(model_result.params["const"])
+    else:
+        intercept = float(obs_intercept[0, 0])
+    selection = np.asarray(fr.selection, dtype=float)[:, :, 0]
+    state_cov = np.asarray(fr.state_cov, dtype=float)[:, :, 0]
+    return {
+        "design": np.asarray(fr.design, dtype=float)[0, :, 0],
+        "obs_intercept": intercept,
+        "obs_cov": float(np.asarray(fr.obs_cov)[0, 0, 0]),
+        "transition": np.asarray(fr.transition, dtype=float)[:, :, 0],
+        "state_intercept": np.asarray(fr.state_intercept, dtype=float)[:, 0],
+        "rqr": selection @ state_cov @ selection.T,
+        "state": np.asarray(fr.predicted_state, dtype=float)[:, n],
+        "state_cov": np.asarray(fr.predicted_state_cov, dtype=float)[:, :, n],
+    }
+
+
+def stack_states(states):
+    if not states:
+        raise ValueError("states must not be empty")
+    b = len(states)
+    m = max(s["state"].shape[0] for s in states)
+    out = {
+        "design": np.zeros((b, m)),
+        "obs_intercept": np.array([s["obs_intercept"] for s in states], dtype=float),
+        "obs_cov": np.array([s["obs_cov"] for s in states], dtype=float),
+        "transition": np.zeros((b, m, m)),
+        "state_intercept": np.zeros((b, m)),
+        "rqr": np.zeros((b, m, m)),
+        "state": np.zeros((b, m)),
+        "state_cov": np.zeros((b, m, m)),
+    }
+    # zero-padded states are never loaded by the design vector, so they do not
+    # affect the forecasts of smaller models
+    for i, s in enumerate(states):
+        k = s["state"].shape[0]
+        out["design"][i, :k] = s["design"]
+        out["transition"][i, :k, :k] = s["transition"]
+        out["state_intercept"][i, :k] = s["state_intercept"]
+        out["rqr"][i, :k, :k] = s["rqr"]
+        out["state"][i, :k] = s["state"]
+        out["state_cov"][i, :k, :k] = s["state_cov"]
+    return out
+
+
+def batch_forecast(states, steps, alpha=0.05):
+    if steps < 1:
+        raise ValueError("steps must be at least 1")
+    if not 0 < alpha < 1:
+        raise ValueError("alpha must be between 0 and 1")
+    st = stack_states(states) if isinstance(states, (list, tuple)) else states
+    Z = st["design"]
+    T = st["transition"]
+    Tt = np.swapaxes(T, 1, 2)
+    a = st["state"].copy()
+    P = st["state_cov"].copy()
+    b = a.shape[0]
+    mean = np.empty((b, steps))
+    var = np.empty((b, steps))
+    for h in range(steps):
+        mean[:, h] = np.einsum("bm,bm->b", Z, a) + st["obs_intercept"]
+        var[:, h] = np.einsum("bi,bij,bj->b", Z, P, Z) + st["obs_cov"]
+        a = np.einsum("bij,bj->bi", T, a) + st["state_intercept"]
+        P = T @ P @ Tt + st["rqr"]
+    q = norm.ppf(1 - alpha / 2)
+    half = q * np.sqrt(np.clip(var, 0.0, None))
+    conf = np.stack([mean - half, mean + half], axis=-1)
+    return mean, conf
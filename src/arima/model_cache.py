@@ -0,0 +1,97 @@
+import hashlib
+from collections import OrderedDict
+
+import pandas as pd
+import numpy as np
+
+from src.arima.arima_model import fit_arima, forecast
+
+
+def data_fingerprint(series):
+    s = series.dropna().astype(float)
+    h = hashlib.blake2b(digest_size=16)
+    h.update(np.ascontiguousarray(s.values).tobytes())
+    h.update(pd.util.hash_pandas_object(s.index, index=False).values.tobytes())
+    return h.hexdigest()
+
+
+def refit_arima(prev_result, series, order=None, reestimate=False):
+    if not isinstance(series, pd.Series):
+        raise TypeError("Input must be a pandas Series")
+    s = series.dropna().astype(float)
+    order = prev_result.model.order if order is None else tuple(order)
+    n = int(prev_result.nobs)
+    old = prev_result.model.data.orig_endog
+    extends = (
+        not reestimate
+        and order == tuple(prev_result.model.order)
+        and len(s) > n
+        and s.index[:n].equals(old.index)
+        and np.array_equal(s.values[:n], np.asarray(old, dtype=float).ravel())
+    )
+    if extends:
+        return prev_result.append(s.iloc[n:], refit=False)
+    start = prev_result.params.values if order == tuple(prev_result.model.order) else None
+    return fit_arima(s, order, start_params=start)
+
+
+class ARIMACache:
+    def __init__(self, max_entries=256):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = int(max_entries)
+        self._entries = OrderedDict()
+        self._latest = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _put(self, key, result):
+        self._entries[key] = {"result": result, "forecasts": {}}
+        self._entries.move_to_end(key)
+        self._latest[key[:2]] = key
+        while len(self._entries) > self.max_entries:
+            old_key, _ = self._entries.popitem(last=False)
+            if self._latest.get(old_key[:2]) == old_key:
+                del self._latest[old_key[:2]]
+
+    def get(self, series_id, series, order):
+        key = (series_id, tuple(order), data_fingerprint(series))
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        self._entries.move_to_end(key)
+        return entry["result"]
+
+    def fit(self, series_id, series, order, reestimate=False):
+        return self._fit(series_id, series, order, reestimate)[1]["result"]
+
+    def _fit(self, series_id, series, order, reestimate):
+        if not isinstance(series, pd.Series):
+            raise TypeError("Input must be a pandas Series")
+        order = tuple(order)
+        key = (series_id, order, data_fingerprint(series))
+        if key in self._entries:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return key, self._entries[key]
+        self.misses += 1
+        prev_key = self._latest.get((series_id, order))
+        if prev_key is not None and prev_key in self._entries:
+            res = refit_arima(self._entries[prev_key]["result"], series, order, reestimate=reestimate)
+        else:
+            res = fit_arima(series, order)
+        self._put(key, res)
+        return key, self._entries[key]
+
+    def forecast(self, series_id, series, order, steps):
+        _, entry = self._fit(series_id, series, order, False)
+        if steps not in entry["forecasts"]:
+            entry["forecasts"][steps] = forecast(entry["result"], steps)
+        return entry["forecasts"][steps]
+
+    def clear(self):
+        self._entries.clear()
+        self._latest.clear()
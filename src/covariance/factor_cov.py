@@ -0,0 +1,87 @@
+import pandas as pd
+import numpy as np
+
+
+def _n_factors(vals, variance_cutoff, n_factors):
+    if n_factors is not None:
+        if not 1 <= n_factors <= len(vals):
+            raise ValueError("n_factors must be between 1 and the number of assets")
+        return int(n_factors)
+    if not 0 < variance_cutoff <= 1:
+        raise ValueError("variance_cutoff must be in (0, 1]")
+    cum = np.cumsum(vals) / np.sum(vals)
+    return int(min(np.searchsorted(cum, variance_cutoff) + 1, len(vals)))
+
+
+class FactorCovariance:
+    def __init__(self, loadings, factor_cov, specific_var, columns=None):
+        self.loadings = np.asarray(loadings, dtype=float)
+        self.factor_cov = np.asarray(factor_cov, dtype=float)
+        self.specific_var = np.asarray(specific_var, dtype=float)
+        n, k = self.loadings.shape
+        if self.factor_cov.shape != (k, k):
+            raise ValueError("factor_cov must be K x K")
+        if self.specific_var.shape != (n,):
+            raise ValueError("specific_var must have one entry per asset")
+        self.columns = pd.RangeIndex(n) if columns is None else pd.Index(columns)
+
+    @classmethod
+    def from_cov(cls, cov, variance_cutoff=0.99, n_factors=None):
+        if not isinstance(cov, pd.DataFrame):
+            raise TypeError("cov must be a pandas DataFrame")
+        c = cov.values
+        vals, vecs = np.linalg.eigh(c)
+        idx = vals.argsort()[::-1]
+        vals = vals[idx]
+        vecs = vecs[:, idx]
+        k = _n_factors(vals, variance_cutoff, n_factors)
+        return cls._from_pca(vecs[:, :k], vals[:k], np.diag(c), cov.columns)
+
+    @classmethod
+    def from_returns(cls, returns, variance_cutoff=0.99, n_factors=None):
+        if not isinstance(returns, pd.DataFrame):
+            raise TypeError("Input must be a pandas DataFrame")
+        r = returns.dropna().astype(float)
+        x = r.values - r.values.mean(axis=0)
+        # thin SVD of the returns avoids forming the N x N sample covariance
+        _, s, vt = np.linalg.svd(x, full_matrices=False)
+        vals = s ** 2 / (x.shape[0] - 1)
+        k = _n_factors(vals, variance_cutoff, n_factors)
+        return cls._from_pca(vt[:k].T, vals[:k], x.var(axis=0, ddof=1), r.columns)
+
+    @classmethod
+    def _from_pca(cls, vecs, vals, total_var, columns):
+        vals = np.clip(vals, 0.0, None)
+        common = np.einsum("ik,k,ik->i", vecs, vals, vecs)
+        return cls(vecs, np.diag(vals), np.clip(total_var - common, 0.0, None), columns)
+
+    @property
+    def shape(self):
+        n = self.loadings.shape[0]
+        return (n, n)
+
+    @property
+    def n_factors(self):
+        return self.loadings.shape[1]
+
+    def loading_matrix(self):
+        vals, vecs = np.linalg.eigh(self.factor_cov)
+        return self.loadings @ (vecs * np.sqrt(np.clip(vals, 0.0, None)))
+
+    def to_dense(self):
+        c = self.loadings @ self.factor_cov @ self.loadings.T + np.diag(self.specific_var)
+        return pd.DataFrame(c, index=self.columns, columns=self.columns)
+
+    def portfolio_variance(self, weights):
+        w = np.asarray(weights, dtype=float).ravel()
+        if w.shape[0] != self.loadings.shape[0]:
+            raise ValueError("weights length must match cov dimension")
+        y = self.loadings.T @ w
+        return float(y @ self.factor_cov @ y + np.sum(self.specific_var * w * w))
+
+    def sample(self, n_samples, z_factors=None, z_specific=None):
+        if z_factors is None:
+            z_factors = np.random.randn(n_samples, self.n_factors)
+        if z_specific is None:
+            z_specific = np.random.randn(n_samples, self.loadings.shape[0])
+        return z_factors @ self.loading_matrix().T + z_specific * np.sqrt(self.specific_var)
@@ -0,0 +1,75 @@
+import pandas as pd
+import numpy as np
+
+
+def _stack(returns):
+    if isinstance(returns, pd.DataFrame):
+        r = returns.dropna().astype(float)
+        return r.to_numpy()[None], returns.columns
+    if isinstance(returns, np.ndarray):
+        if returns.ndim not in (2, 3):
+            raise ValueError("returns must be a 2-D window or a 3-D stack of windows")
+        x = returns.astype(float, copy=False)
+        return (x[None] if x.ndim == 2 else x), None
+    raise TypeError("Input must be a pandas DataFrame or numpy array")
+
+
+def _scaled_identity(mu, p):
+    return mu[:, None, None] * np.eye(p)[None]
+
+
+def shrinkage_estimators(returns, alpha=0.5):
+    if not 0 <= alpha <= 1:
+        raise ValueError("alpha must be between 0 and 1")
+    x, columns = _stack(returns)
+    b, n, p = x.shape
+    if n < 2:
+        raise ValueError("at least two observations are required")
+    xc = x - x.mean(axis=1, keepdims=True)
+    # one cross-product per window feeds every estimator below
+    xtx = np.matmul(np.swapaxes(xc, 1, 2), xc)
+    emp = xtx / n
+    sample = xtx / (n - 1)
+    trace = np.trace(emp, axis1=1, axis2=2)
+    mu = trace / p
+    frob = np.sum(emp * emp, axis=(1, 2))
+
+    if p == 1:
+        lw_s = np.zeros(b)
+        oas_s = np.zeros(b)
+    else:
+        # Ledoit-Wolf as in sklearn.covariance.ledoit_wolf_shrinkage
+        beta_ = np.sum(np.sum(xc * xc, axis=2) ** 2, axis=1)
+        beta = (beta_ / n - frob) / (p * n)
+        delta = (frob - 2.0 * mu * trace + p * mu ** 2) / p
+        beta = np.minimum(beta, delta)
+        lw_s = np.where(beta == 0, 0.0, beta / np.where(delta == 0, 1.0, delta))
+        # OAS as in sklearn.covariance.oas
+        a = frob / (p * p)
+        num = a + mu ** 2
+        den = (n + 1) * (a - mu ** 2 / p)
+        oas_s = np.where(den == 0, 1.0, np.minimum(num / np.where(den == 0, 1.0, den), 1.0))
+
+    target = _scaled_identity(mu, p)
+    lw = (1.0 - lw_s)[:, None, None] * emp + lw_s[:, None, None] * target
+    oas = (1.0 - oas_s)[:, None, None] * emp + oas_s[:, None, None] * target
+    diag = sample * np.eye(p)[None]
+    diagonal = alpha * diag + (1 - alpha) * sample
+
+    out = {
+        "sample": sample,
+        "ledoit_wolf": lw,
+        "oas": oas,
+        "diagonal": diagonal,
+        "lw_shrinkage": lw_s,
+        "oas_shrinkage": oas_s,
+    }
+    if isinstance(returns, np.ndarray) and returns.ndim == 3:
+        return out
+    single = {k: v[0] for k, v in out.items()}
+    single["lw_shrinkage"] = float(single["lw_shrinkage"])
+    single["oas_shrinkage"] = float(single["oas_shrinkage"])
+    if columns is not None:
+        for k in ("sample", "ledoit_wolf", "oas", "diagonal"):
+            single[k] = pd.DataFrame(single[k], index=columns, columns=columns)
+    return single
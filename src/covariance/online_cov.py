@@ -0,0 +1,145 @@
+import pandas as pd
+import numpy as np
+
+MODES = ("welford", "ewma", "window")
+
+
+class OnlineCovariance:
+    def __init__(self, columns=None, mode="welford", span=None, window=None):
+        if mode not in MODES:
+            raise ValueError(f"mode must be one of {MODES}")
+        if mode == "ewma" and (span is None or span < 1):
+            raise ValueError("ewma mode requires span >= 1")
+        if mode == "window" and (window is None or window < 2):
+            raise ValueError("window mode requires window >= 2")
+        self.mode = mode
+        self.span = span
+        self.window = int(window) if window is not None else None
+        self.alpha = 2.0 / (span + 1.0) if mode == "ewma" else None
+        self.columns = None
+        self.n = 0
+        self.mean = None
+        self._m2 = None
+        self._sum_wt2 = 1.0
+        self._buf = None
+        self._pos = 0
+        if columns is not None:
+            self._init(pd.Index(columns) if not isinstance(columns, int) else pd.RangeIndex(columns))
+
+    def _init(self, columns):
+        k = len(columns)
+        self.columns = columns
+        self.mean = np.zeros(k)
+        self._m2 = np.zeros((k, k))
+        if self.mode == "window":
+            self._buf = np.zeros((self.window, k))
+
+    def _rows(self, data):
+        if isinstance(data, pd.DataFrame):
+            if self.columns is None:
+                self._init(data.columns)
+            elif not data.columns.equals(self.columns):
+                data = data[self.columns]
+            x = data.to_numpy(dtype=float)
+        elif isinstance(data, pd.Series):
+            if self.columns is None:
+                self._init(data.index)
+            elif not data.index.equals(self.columns):
+                data = data[self.columns]
+            x = data.to_numpy(dtype=float)[None]
+        else:
+            x = np.atleast_2d(np.asarray(data, dtype=float))
+            if self.columns is None:
+                self._init(pd.RangeIndex(x.shape[1]))
+        if x.shape[1] != len(self.columns):
+            raise ValueError("observation length must match the number of assets")
+        return x[~np.isnan(x).any(axis=1)]
+
+    def update(self, x):
+        for row in self._rows(x):
+            self._update(row)
+        return self
+
+    def update_batch(self, data):
+        x = self._rows(data)
+        if self.mode == "welford" and x.shape[0] > 0:
+            self._merge(x)
+        else:
+            for row in x:
+                self._update(row)
+        return self
+
+    def _merge(self, x):
+        # Chan et al. pairwise combination of the running and the batch moments
+        nb = x.shape[0]
+        mb = x.mean(axis=0)
+        xc = x - mb
+        n = self.n + nb
+        delta = mb - self.mean
+        self._m2 += xc.T @ xc + np.outer(delta, delta) * (self.n * nb / n)
+        self.mean += delta * (nb / n)
+        self.n = n
+
+    def _update(self, x):
+        if self.mode == "welford":
+            self.n += 1
+            delta = x - self.mean
+            self.mean += delta / self.n
+            self._m2 += np.outer(delta, x - self.mean)
+        elif self.mode == "ewma":
+            self._update_ewma(x)
+        else:
+            self._update_window(x)
+
+    def _update_ewma(self, x):
+        self.n += 1
+        if self.n == 1:
+            self.mean = x.copy()
+            return
+        a = self.alpha
+        d = 1.0 - a
+        old = self.mean
+        self.mean = d * old + a * x
+        dm = old - self.mean
+        dx = x - self.mean
+        self._m2 = d * (self._m2 + np.outer(dm, dm)) + a * np.outer(dx, dx)
+        self._sum_wt2 = d * d * self._sum_wt2 + a * a
+
+    def _update_window(self, x):
+        if self.n == self.window:
+            old = self._buf[self._pos].copy()
+            mean_after = (self.n * self.mean - old) / (self.n - 1)
+            self._m2 -= np.outer(old - self.mean, old - mean_after)
+            self.mean = mean_after
+            self.n -= 1
+        self._buf[self._pos] = x
+        self._pos = (self._pos + 1) % self.window
+        self.n += 1
+        delta = x - self.mean
+        self.mean += delta / self.n
+        self._m2 += np.outer(delta, x - self.mean)
+
+    def _cov_values(self):
+        if self.columns is None or self.n < 2:
+            k = 0 if self.columns is None else len(self.columns)
+            return np.full((k, k), np.nan)
+        if self.mode == "ewma":
+            return self._m2 / (1.0 - self._sum_wt2)
+        return self._m2 / (self.n - 1)
+
+    def _frame(self, values):
+        return pd.DataFrame(values, index=self.columns, columns=self.columns)
+
+    def cov(self):
+        return self._frame(self._cov_values())
+
+    def corr(self):
+        c = self._cov_values()
+        d = np.sqrt(np.diag(c))
+        return self._frame(c / np.outer(d, d))
+
+    def annualized_cov(self, periods=252):
+        return self._frame(self._cov_values() * periods)
+
+    def annualized_vol(self, periods=252):
+        return pd.Series(np.sqrt(np.diag(self._cov_values()) * periods), index=self.columns)
@@ -0,0 +1,97 @@
+import json
+from pathlib import Path
+
+import pandas as pd
+import numpy as np
+
+
+def _meta_path(path):
+    p = Path(path)
+    return p.with_name(p.name + ".json")
+
+
+class RollingCovCube:
+    def __init__(self, values, dates, columns, window):
+        self.values = values
+        self.dates = pd.Index(dates)
+        self.columns = pd.Index(columns)
+        self.window = window
+
+    @classmethod
+    def open(cls, path):
+        p = Path(path)
+        if not p.exists():
+            raise FileNotFoundError(f"File not found: {path}")
+        meta = json.loads(_meta_path(p).read_text())
+        values = np.load(p, mmap_mode="r")
+        dates = pd.to_datetime(meta["dates"]) if meta["datetime"] else meta["dates"]
+        return cls(values, dates, meta["columns"], meta["window"])
+
+    def __len__(self):
+        return self.values.shape[0]
+
+    def cov_at(self, i):
+        return pd.DataFrame(np.asarray(self.values[i], dtype=float), index=self.columns, columns=self.columns)
+
+    def cov_on(self, date):
+        return self.cov_at(self.dates.get_loc(date))
+
+
+def _write_meta(path, dates, columns, window):
+    is_dt = isinstance(dates, pd.DatetimeIndex)
+    meta = {
+        "dates": [d.isoformat() for d in dates] if is_dt else dates.tolist(),
+        "datetime": is_dt,
+        "columns": columns.tolist(),
+        "window": window,
+    }
+    _meta_path(path).write_text(json.dumps(meta, default=str))
+
+
+def rolling_cov_cube(returns, window, path=None, dtype="float64", block_size=None, max_block_bytes=2 ** 26, refresh=256):
+    if not isinstance(returns, pd.DataFrame):
+        raise TypeError("Input must be a pandas DataFrame")
+    if window < 2:
+        raise ValueError("window must be at least 2")
+    r = returns.dropna().astype(float)
+    x = r.to_numpy()
+    t, n = x.shape
+    if block_size is None:
+        block_size = max(1, int(max_block_bytes // (8 * n * n)))
+    if block_size < 1:
+        raise ValueError("block_size must be at least 1")
+    if window > t:
+        raise ValueError("window is longer than the available history")
+    dates = r.index[window - 1:]
+    shape = (t - window + 1, n, n)
+    if path is None:
+        out = np.empty(shape, dtype=dtype)
+    else:
+        out = np.lib.format.open_memmap(path, mode="w+", dtype=dtype, shape=shape)
+    next_exact = 0
+    for b0 in range(0, shape[0], block_size):
+        b1 = min(b0 + block_size, shape[0])
+        if b0 >= next_exact:
+            # periodic exact sums bound the drift of the running updates
+            head = x[b0:b0 + window]
+            s1 = head.sum(axis=0)
+            s2 = head.T @ head
+            next_exact = b0 + refresh
+        hi = min(b1, shape[0] - 1)
+        add = x[b0 + window:hi + window]
+        drop = x[b0:hi]
+        sums1 = np.empty((hi - b0 + 1, n))
+        sums2 = np.empty((hi - b0 + 1, n, n))
+        sums1[0], sums2[0] = s1, s2
+        np.cumsum(add - drop, axis=0, out=sums1[1:])
+        np.cumsum(np.einsum("ti,tj->tij", add, add) - np.einsum("ti,tj->tij", drop, drop), axis=0, out=sums2[1:])
+        sums1[1:] += s1
+        sums2[1:] += s2
+        s1, s2 = sums1[-1], sums2[-1]
+        k = b1 - b0
+        mean = sums1[:k] / window
+        out[b0:b1] = (sums2[:k] - window * mean[:, :, None] * mean[:, None, :]) / (window - 1)
+    if path is not None:
+        out.flush()
+        _write_meta(path, dates, r.columns, window)
+    return RollingCovCube(out, dates, r.columns, window)
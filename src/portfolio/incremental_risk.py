@@ -0,0 +1,109 @@
+import math
+
+import pandas as pd
+import numpy as np
+
+from src.covariance.factor_cov import FactorCovariance
+
+
+class PortfolioRisk:
+    def __init__(self, cov, weights):
+        if not isinstance(cov, (pd.DataFrame, FactorCovariance)):
+            raise TypeError("cov must be a pandas DataFrame or FactorCovariance")
+        self.cov = cov
+        self.columns = cov.columns
+        self._dense = cov.to_numpy(dtype=float) if isinstance(cov, pd.DataFrame) else None
+        w = np.asarray(weights, dtype=float).ravel()
+        if w.shape[0] != cov.shape[0]:
+            raise ValueError("weights length must match cov dimension")
+        self._w = w.copy()
+        self.refresh()
+
+    def refresh(self):
+        # exact recomputation; commits update these incrementally
+        if self._dense is not None:
+            self._sw = self._dense @ self._w
+        else:
+            c = self.cov
+            self._sw = c.loadings @ (c.factor_cov @ (c.loadings.T @ self._w)) + c.specific_var * self._w
+        self._var = float(self._w @ self._sw)
+        return self
+
+    @property
+    def weights(self):
+        return pd.Series(self._w.copy(), index=self.columns)
+
+    @property
+    def variance(self):
+        return self._var
+
+    @property
+    def volatility(self):
+        return math.sqrt(max(self._var, 0.0))
+
+    @property
+    def marginal(self):
+        return pd.Series(self._sw / self.volatility, index=self.columns)
+
+    def _columns(self, idx):
+        # Sigma[:, idx] in O(N k)
+        if self._dense is not None:
+            return self._dense[:, idx]
+        c = self.cov
+        out = c.loadings @ (c.factor_cov @ c.loadings[idx].T)
+        out[idx, np.arange(len(idx))] += c.specific_var[idx]
+        return out
+
+    def _block(self, idx):
+        if self._dense is not None:
+            return self._dense[np.ix_(idx, idx)]
+        c = self.cov
+        b = c.loadings[idx]
+        return b @ c.factor_cov @ b.T + np.diag(c.specific_var[idx])
+
+    def _trade(self, trade):
+        if isinstance(trade, dict):
+            labels, d = list(trade.keys()), np.fromiter(trade.values(), dtype=float, count=len(trade))
+        elif isinstance(trade, pd.Series):
+            if not trade.index.is_unique:
+                trade = trade.groupby(level=0).sum()
+            labels, d = trade.index, trade.to_numpy(dtype=float)
+        else:
+            raise TypeError("trade must be a dict or pandas Series of weight changes")
+        idx = self.columns.get_indexer(labels)
+        if (idx < 0).any():
+            raise ValueError("trade contains assets not in the covariance")
+        return idx, d
+
+    def _new_variance(self, idx, d):
+        return self._var + 2 * d @ self._sw[idx] + d @ self._block(idx) @ d
+
+    def what_if(self, trade):
+        idx, d = self._trade(trade)
+        v = float(self._new_variance(idx, d))
+        return {"variance": v, "volatility": math.sqrt(max(v, 0.0)), "change": v - self._var}
+
+    def what_if_batch(self, trades):
+        if isinstance(trades, pd.DataFrame):
+            # candidates x traded assets: one k x k block serves every row
+            idx = self.columns.get_indexer(trades.columns)
+            if (idx < 0).any():
+                raise ValueError("trade contains assets not in the covariance")
+            d = trades.fillna(0.0).to_numpy(dtype=float)
+            v = self._var + 2 * d @ self._sw[idx] + np.einsum("mk,kl,ml->m", d, self._block(idx), d)
+            index = trades.index
+        else:
+            if isinstance(trades, dict):
+                index, trades = list(trades.keys()), list(trades.values())
+            else:
+                index = None
+            v = np.array([self._new_variance(*self._trade(t)) for t in trades], dtype=float)
+        out = pd.DataFrame({"variance": v, "volatility": np.sqrt(np.clip(v, 0.0, None)), "change": v - self._var}, index=index)
+        return out
+
+    def commit(self, trade):
+        idx, d = self._trade(trade)
+        self._var = float(self._new_variance(idx, d))
+        self._sw = self._sw + self._columns(idx) @ d
+        self._w[idx] += d
+        return self
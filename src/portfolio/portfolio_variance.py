@@ -1,14 +1,17 @@
 import pandas as pd
 import numpy as np
+from src.covariance.factor_cov import FactorCovariance
 
 def portfolio_variance(cov, weights):
+    if isinstance(cov, FactorCovariance):
+        return cov.portfolio_variance(weights)
     if not isinstance(cov, pd.DataFrame):
-        raise TypeError("cov must be a pandas DataFrame")
+        raise TypeError("cov must be a pandas DataFrame or FactorCovariance")
     w = np.asarray(weights, dtype=float).reshape(-1, 1)
     if w.shape[0] != cov.shape[0]:
         raise ValueError("weights length must match cov dimension")
     c = cov.values
-    return float(w.T @ c @ w)
+    return float((w.T @ c @ w).item())
 
 def portfolio_volatility(cov, weights):
     v = portfolio_variance(cov, weights)
@@ -16,7 +19,7 @@ def portfolio_volatility(cov, weights):
 
 def scenario_variance(cov_scenarios, weights):
     if not isinstance(cov_scenarios, dict):
-        raise TypeError("cov_scenarios must be a dict of DataFrames")
+        raise TypeError("cov_scenarios must be a dict of DataFrames or FactorCovariance objects")
     out = {}
     for name, cov in cov_scenarios.items():
         out[name] = portfolio_variance(cov, weights)
@@ -24,4 +27,65 @@ def scenario_variance(cov_scenarios, weights):
 
 def scenario_volatility(cov_scenarios, weights):
     v = scenario_variance(cov_scenarios, weights)
-    return {k: float(np.sqrt(val)) for k, val in v.items()}
\ No newline at end of file
+    return {k: float(np.sqrt(val)) for k, val in v.items()}
+
+def _weight_matrix(weights):
+    if isinstance(weights, pd.DataFrame):
+        return weights.to_numpy(dtype=float), weights.index
+    w = np.asarray(weights, dtype=float)
+    if w.ndim == 1:
+        w = w[None]
+    if w.ndim != 2:
+        raise ValueError("weights must be a vector or a P x N matrix")
+    return w, None
+
+def _scenario_stack(cov_scenarios):
+    if isinstance(cov_scenarios, dict):
+        names, covs = list(cov_scenarios.keys()), list(cov_scenarios.values())
+    elif isinstance(cov_scenarios, np.ndarray):
+        c = cov_scenarios.astype(float, copy=False)
+        if c.ndim == 2:
+            c = c[None]
+        if c.ndim != 3 or c.shape[1] != c.shape[2]:
+            raise ValueError("scenario stack must be S x N x N")
+        return None, c, [], list(range(c.shape[0]))
+    elif isinstance(cov_scenarios, (pd.DataFrame, FactorCovariance)):
+        names, covs = None, [cov_scenarios]
+    else:
+        raise TypeError("cov_scenarios must be a dict, a DataFrame, a FactorCovariance or an S x N x N array")
+    dense, factor = [], []
+    for i, cov in enumerate(covs):
+        if isinstance(cov, FactorCovariance):
+            factor.append((i, cov))
+        elif isinstance(cov, pd.DataFrame):
+            dense.append((i, cov.to_numpy(dtype=float)))
+        else:
+            raise TypeError("cov must be a pandas DataFrame or FactorCovariance")
+    stack = np.stack([c for _, c in dense]) if dense else None
+    return names, stack, factor, [i for i, _ in dense]
+
+def batch_portfolio_variance(weights, cov_scenarios, max_block_bytes=2**26):
+    w, index = _weight_matrix(weights)
+    names, stack, factor, dense_pos = _scenario_stack(cov_scenarios)
+    p, n = w.shape
+    n_scen = len(dense_pos) + len(factor)
+    if (stack is not None and stack.shape[1] != n) or any(cov.shape[0] != n for _, cov in factor):
+        raise ValueError("weights length must match cov dimension")
+    out = np.empty((p, n_scen))
+    if stack is not None:
+        # W C_s W' per scenario; portfolios are blocked so the S x p x N
+        # intermediate stays under max_block_bytes
+        block = max(1, int(max_block_bytes // (8 * n * stack.shape[0])))
+        for start in range(0, p, block):
+            wb = w[start:start + block]
+            y = np.matmul(wb[None], stack)
+            out[start:start + block, dense_pos] = np.einsum("spn,pn->ps", y, wb)
+    for i, cov in factor:
+        y = w @ cov.loadings
+        out[:, i] = np.einsum("pk,kl,pl->p", y, cov.factor_cov, y) + (w * w) @ cov.specific_var
+    if index is None and names is None:
+        return out
+    return pd.DataFrame(out, index=index, columns=names)
+
+def batch_portfolio_volatility(weights, cov_scenarios, max_block_bytes=2**26):
+    return np.sqrt(batch_portfolio_variance(weights, cov_scenarios, max_block_bytes))
@@ -0,0 +1,120 @@
+import math
+
+import pandas as pd
+import numpy as np
+from scipy.stats import norm
+
+from src.covariance.factor_cov import FactorCovariance
+from src.simulation.mc_engine import simulation_loading, iter_chunks
+
+
+def _check_alpha(alpha):
+    if not 0 < alpha < 1:
+        raise ValueError("alpha must be between 0 and 1")
+
+
+def _weights(weights, n):
+    w = np.asarray(weights, dtype=float).ravel()
+    if w.shape[0] != n:
+        raise ValueError("weights length must match cov dimension")
+    return w
+
+
+def _cov_times(cov, w):
+    if isinstance(cov, FactorCovariance):
+        return cov.loadings @ (cov.factor_cov @ (cov.loadings.T @ w)) + cov.specific_var * w
+    return cov.values @ w
+
+
+def _report(var, es, marginal_var, marginal_es, w, columns, **extra):
+    contrib = pd.DataFrame({
+        "marginal_var": marginal_var,
+        "component_var": w * marginal_var,
+        "marginal_es": marginal_es,
+        "component_es": w * marginal_es,
+    }, index=columns)
+    out = {"var": float(var), "es": float(es)}
+    out.update(extra)
+    out["contributions"] = contrib
+    return out
+
+
+def parametric_risk(cov, weights, alpha=0.99, mean=None):
+    if not isinstance(cov, (pd.DataFrame, FactorCovariance)):
+        raise TypeError("cov must be a pandas DataFrame or FactorCovariance")
+    _check_alpha(alpha)
+    w = _weights(weights, cov.shape[0])
+    mu = np.zeros_like(w) if mean is None else _weights(mean, cov.shape[0])
+    sw = _cov_times(cov, w)
+    sigma = math.sqrt(max(float(w @ sw), 0.0))
+    if sigma == 0:
+        raise ValueError("portfolio variance is zero")
+    z = norm.ppf(alpha)
+    k = norm.pdf(z) / (1 - alpha)
+    # Euler allocation: the gradient of sigma is cov @ w / sigma, so the
+    # components sum exactly to the totals
+    grad = sw / sigma
+    return _report(z * sigma - w @ mu, k * sigma - w @ mu, z * grad - mu, k * grad - mu, w, cov.columns, volatility=sigma)
+
+
+def _tail_positions(n, alpha):
+    h = (n - 1) * (1 - alpha)
+    lo = int(math.floor(h))
+    return lo, int(math.ceil(h)), h - lo
+
+
+def _tail_report(pnl, scen, n, alpha, w, columns):
+    # pnl/scen hold (at least) the worst ceil(h)+1 scenarios out of n; the VaR
+    # matches np.quantile's linear interpolation and its attribution
+    # interpolates the same two scenarios
+    order = np.argsort(pnl, kind="stable")
+    pnl, scen = pnl[order], scen[order]
+    lo, hi, frac = _tail_positions(n, alpha)
+    q = pnl[lo] + frac * (pnl[hi] - pnl[lo])
+    at_q = scen[lo] + frac * (scen[hi] - scen[lo])
+    tail = pnl <= q
+    return _report(-q, -pnl[tail].mean(), -at_q, -scen[tail].mean(axis=0), w, columns, n_tail=int(tail.sum()))
+
+
+def historical_risk(returns, weights, alpha=0.99):
+    if not isinstance(returns, pd.DataFrame):
+        raise TypeError("Input must be a pandas DataFrame")
+    _check_alpha(alpha)
+    r = returns.dropna().astype(float)
+    if len(r) < 2:
+        raise ValueError("at least two observations are required")
+    w = _weights(weights, r.shape[1])
+    x = r.to_numpy()
+    pnl = x @ w
+    return _tail_report(pnl, x, len(pnl), alpha, w, r.columns)
+
+
+class _TailKeeper:
+    def __init__(self, weights, n_keep):
+        self.weights = weights
+        self.n_keep = n_keep
+        self.pnl = np.empty(0)
+        self.scen = np.empty((0, weights.shape[0]))
+
+    def update(self, chunk):
+        pnl = np.concatenate([self.pnl, chunk @ self.weights])
+        scen = np.concatenate([self.scen, chunk])
+        if pnl.shape[0] > self.n_keep:
+            keep = np.argpartition(pnl, self.n_keep - 1)[:self.n_keep]
+            pnl, scen = pnl[keep], scen[keep]
+        self.pnl, self.scen = pnl, scen
+
+
+def mc_risk(cov, weights, alpha=0.99, n_samples=100_000, chunk_size=100_000, seed=None, method="cholesky", variance_cutoff=0.99, repair=None):
+    if not isinstance(cov, (pd.DataFrame, FactorCovariance)):
+        raise TypeError("cov must be a pandas DataFrame or FactorCovariance")
+    _check_alpha(alpha)
+    if n_samples < 2:
+        raise ValueError("n_samples must be at least 2")
+    w = _weights(weights, cov.shape[0])
+    loading, spec = simulation_loading(cov, method, variance_cutoff, repair)
+    # only the tail scenarios are needed for VaR, ES and their attribution
+    keeper = _TailKeeper(w, _tail_positions(n_samples, alpha)[1] + 1)
+    for chunk in iter_chunks(loading, n_samples, chunk_size, seed, "float64", spec):
+        keeper.update(chunk)
+    return _tail_report(keeper.pnl, keeper.scen, n_samples, alpha, w, cov.columns)
@@ -0,0 +1,63 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+import numpy as np
+import ruptures as rpt
+
+from src.volatility.panel_vol import panel_rolling_std
+
+
+BREAK_KINDS = ("mean", "volatility")
+
+
+def _signals(data, kind, window):
+    if kind == "volatility":
+        # one pass over the whole panel instead of a rolling std per call
+        data = panel_rolling_std(data, window)
+    return [(name, data[name].dropna().to_numpy(dtype=float)) for name in data.columns]
+
+
+def _empty_row(name, penalty, error):
+    return {"asset": name, "penalty": penalty, "breaks": None, "n_breaks": np.nan, "error": error}
+
+
+def _pelt_path(name, signal, penalties, model, min_size, jump):
+    try:
+        # the cost is fitted once and reused by every predict on the grid
+        algo = rpt.Pelt(model=model, min_size=min_size, jump=jump).fit(signal)
+    except Exception as e:
+        return [_empty_row(name, p, f"{type(e).__name__}: {e}") for p in penalties]
+    rows = []
+    for p in penalties:
+        try:
+            bk = algo.predict(pen=p)
+            rows.append({"asset": name, "penalty": p, "breaks": bk, "n_breaks": len(bk) - 1, "error": None})
+        except Exception as e:
+            rows.append(_empty_row(name, p, f"{type(e).__name__}: {e}"))
+    return rows
+
+
+def batch_breaks(data, penalties, kind="mean", window=20, model="l2", min_size=2, jump=5, n_jobs=None):
+    if not isinstance(data, pd.DataFrame):
+        raise TypeError("Input must be a pandas DataFrame")
+    if kind not in BREAK_KINDS:
+        raise ValueError(f"kind must be one of {BREAK_KINDS}")
+    penalties = [float(p) for p in np.atleast_1d(penalties)]
+    if not penalties:
+        raise ValueError("penalties must not be empty")
+    tasks = _signals(data.astype(float), kind, window)
+    results = {}
+    if n_jobs == 1:
+        for name, sig in tasks:
+            results[name] = _pelt_path(name, sig, penalties, model, min_size, jump)
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs) as ex:
+            futures = {name: ex.submit(_pelt_path, name, sig, penalties, model, min_size, jump) for name, sig in tasks}
+            for name, fut in futures.items():
+                try:
+                    results[name] = fut.result()
+                except Exception as e:
+                    err = f"{type(e).__name__}: {e}"
+                    results[name] = [_empty_row(name, p, err) for p in penalties]
+    rows = [r for name, _ in tasks for r in results[name]]
+    return pd.DataFrame(rows).set_index(["asset", "penalty"])
@@ -0,0 +1,294 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import numpy as np
+from scipy.optimize import minimize
+
+
+def steady_state(transition):
+    # transition[b, i, j] = P(s_t = i | s_{t-1} = j), columns sum to one
+    b, k, _ = transition.shape
+    a = np.concatenate([np.eye(k)[None] - transition, np.ones((b, 1, k))], axis=1)
+    p = np.clip(np.linalg.pinv(a)[:, :, -1], 1e-20, None)
+    return p / p.sum(axis=1, keepdims=True)
+
+
+def default_start_params(y, k=2):
+    # same cold start as statsmodels MarkovRegression(trend="c", switching_variance=True)
+    y = np.asarray(y, dtype=float)
+    mean = np.nanmean(y, axis=1)
+    var = np.nanvar(y, axis=1)
+    b = y.shape[0]
+    return {
+        "means": mean[:, None] * (np.arange(k) / k)[None],
+        "variances": var[:, None] * np.linspace(0.1, 1.0, k)[None],
+        "transition": np.full((b, k, k), 1.0 / k),
+    }
+
+
+def hamilton_filter(y, params, initial=None):
+    y = np.asarray(y, dtype=float)
+    mu, s2, P = params["means"], params["variances"], params["transition"]
+    b, n = y.shape
+    k = mu.shape[1]
+    filt = steady_state(P) if initial is None else np.asarray(initial, dtype=float)
+    filtered = np.empty((b, n, k))
+    predicted = np.empty((b, n, k))
+    loglik = np.zeros(b)
+    norm = -0.5 * np.log(2 * np.pi * s2)
+    for t in range(n):
+        pred = np.einsum("bij,bj->bi", P, filt) if t or initial is not None else filt
+        predicted[:, t] = pred
+        yt = y[:, t]
+        miss = np.isnan(yt)
+        # missing ticks only propagate the chain; densities stay in log space
+        # so a tick far out in every regime cannot underflow to zero
+        e = np.where(miss, 0.0, yt)[:, None] - mu
+        logdens = norm - 0.5 * e * e / s2
+        logdens[miss] = 0.0
+        with np.errstate(divide="ignore"):
+            joint = np.log(pred) + logdens
+        top = joint.max(axis=1)
+        lik = top + np.log(np.exp(joint - top[:, None]).sum(axis=1))
+        filt = np.exp(joint - lik[:, None])
+        filtered[:, t] = filt
+        loglik += lik
+    return filtered, predicted, loglik
+
+
+def kim_smoother(filtered, predicted, transition, return_joint=False):
+    b, n, k = filtered.shape
+    smoothed = np.empty_like(filtered)
+    smoothed[:, -1] = filtered[:, -1]
+    joint = np.zeros((b, k, k)) if return_joint else None
+    for t in range(n - 2, -1, -1):
+        ratio = smoothed[:, t + 1] / np.maximum(predicted[:, t + 1], 1e-300)
+        # xi[b, i, j] = P(s_{t+1} = i, s_t = j | all data)
+        xi = transition * ratio[:, :, None] * filtered[:, t][:, None, :]
+        smoothed[:, t] = xi.sum(axis=1)
+        if return_joint:
+            joint += xi
+    return (smoothed, joint) if return_joint else smoothed
+
+
+def _em_step(y, smoothed, joint, params, floor):
+    # statsmodels' EM update: the transition counts include the pair
+    # (s_0, s_-1) drawn from the steady state and are normalised by the
+    # smoothed occupancy of every tick
+    P = params["transition"]
+    pi = steady_state(P)
+    num = joint + P * (smoothed[:, 0] / pi)[:, :, None] * pi[:, None, :]
+    free = num[:, :-1] / np.maximum(smoothed.sum(axis=1), 1e-300)[:, None, :]
+    over = np.maximum(free.sum(axis=1) - 1.0, 0.0)
+    free = free / np.where(over > 0, 1.0 + over + 1e-6, 1.0)[:, None, :]
+    P = np.concatenate([free, 1.0 - free.sum(axis=1, keepdims=True)], axis=1)
+    obs = ~np.isnan(y)
+    yz = np.where(obs, y, 0.0)
+    wts = smoothed * obs[:, :, None]
+    tot = np.maximum(wts.sum(axis=1), 1e-300)
+    mu = np.einsum("btk,bt->bk", wts, yz) / tot
+    e = yz[:, :, None] - mu[:, None, :]
+    s2 = np.maximum(np.einsum("btk,btk->bk", wts, e * e) / tot, floor)
+    return {"means": mu, "variances": s2, "transition": P}
+
+
+def _to_theta(params):
+    # statsmodels' unconstrained coordinates: means, standard deviations and
+    # transition logits against the last regime
+    P = params["transition"]
+    k = P.shape[1]
+    logits = np.log(np.maximum(P[:, :-1], 1e-300)) - np.log(np.maximum(P[:, -1:], 1e-300))
+    return np.concatenate([params["means"], np.sqrt(params["variances"]), logits.reshape(len(P), (k - 1) * k)], axis=1)
+
+
+def _from_theta(theta, k):
+    b = theta.shape[0]
+    logits = np.concatenate([theta[:, 2 * k:].reshape(b, k - 1, k), np.zeros((b, 1, k))], axis=1)
+    logits -= logits.max(axis=1, keepdims=True)
+    P = np.exp(logits)
+    return {"means": theta[:, :k], "variances": theta[:, k:2 * k] ** 2, "transition": P / P.sum(axis=1, keepdims=True)}
+
+
+def _score(y, params, filtered, predicted, sd):
+    # gradient of the log-likelihood in theta through the Fisher identity:
+    # the expected complete-data score under the smoothed probabilities
+    mu, s2, P = params["means"], params["variances"], params["transition"]
+    smoothed, joint = kim_smoother(filtered, predicted, P, return_joint=True)
+    obs = ~np.isnan(y)
+    wts = smoothed * obs[:, :, None]
+    e = np.where(obs, y, 0.0)[:, :, None] - mu[:, None, :]
+    g_mu = np.einsum("btk,btk->bk", wts, e) / s2
+    g_sd = (np.einsum("btk,btk->bk", wts, e * e) / s2 - wts.sum(axis=1)) / sd
+    k = P.shape[1]
+    pi = steady_state(P)
+    Z = np.linalg.inv(np.eye(k)[None] - P + pi[:, :, None])
+    g = np.einsum("bli,bl->bi", Z, smoothed[:, 0] / pi)
+    a = joint + P * g[:, :, None] * pi[:, None, :]
+    g_x = a[:, :-1] - P[:, :-1] * a.sum(axis=1, keepdims=True)
+    return np.concatenate([g_mu, g_sd, g_x.reshape(len(P), -1)], axis=1)
+
+
+def _evaluate(y, theta, k, nobs):
+    # -llf / nobs and its gradient, the objective statsmodels hands to BFGS
+    with np.errstate(all="ignore"):
+        params = _from_theta(theta, k)
+        filtered, predicted, ll = hamilton_filter(y, params)
+        grad = -_score(y, params, filtered, predicted, theta[:, k:2 * k]) / nobs[:, None]
+    f = -ll / nobs
+    bad = ~np.isfinite(f) | ~np.isfinite(grad).all(axis=1)
+    f[bad] = np.inf
+    grad[bad] = 0.0
+    return f, grad
+
+
+def _polish(y, theta, k, max_iter, gtol):
+    # scipy's BFGS with statsmodels' settings, one solver thread per series.
+    # Every objective call blocks until all live solvers have asked for a
+    # point, and the main thread answers them with one batched filter and
+    # smoother pass, so each series follows exactly its own BFGS path
+    b = len(theta)
+    nobs = np.maximum((~np.isnan(y)).sum(axis=1), 1)
+    cond = threading.Condition()
+    asked, answers, running = {}, {}, set(range(b))
+    failed = []
+
+    def objective(x, i):
+        with cond:
+            asked[i] = np.array(x, dtype=float)
+            cond.notify_all()
+            cond.wait_for(lambda: i in answers or failed)
+            if failed:
+                raise RuntimeError("batched likelihood evaluation failed")
+            return answers.pop(i)
+
+    def solve(i):
+        try:
+            return minimize(objective, theta[i], args=(i,), jac=True, method="BFGS",
+                            options={"gtol": gtol, "maxiter": max_iter, "norm": np.inf})
+        finally:
+            with cond:
+                running.discard(i)
+                cond.notify_all()
+
+    with ThreadPoolExecutor(max_workers=b) as ex:
+        futures = [ex.submit(solve, i) for i in range(b)]
+        try:
+            while True:
+                with cond:
+                    cond.wait_for(lambda: len(asked) == len(running))
+                    if not running:
+                        break
+                    batch, asked = asked, {}
+                ids = np.fromiter(batch, dtype=np.int64)
+                f, grad = _evaluate(y[ids], np.stack([batch[i] for i in ids]), k, nobs[ids])
+                with cond:
+                    for j, i in enumerate(ids):
+                        answers[i] = (f[j], grad[j])
+                    cond.notify_all()
+        except BaseException:
+            # release the waiting solvers so the pool can shut down
+            with cond:
+                failed.append(True)
+                cond.notify_all()
+            raise
+        results = [fut.result() for fut in futures]
+    return np.stack([r.x for r in results]), max(r.nit for r in results)
+
+
+def _order(params, arrays):
+    # regimes sorted by variance so labels are stable across refits
+    idx = np.argsort(params["variances"], axis=1)
+    rows = np.arange(idx.shape[0])[:, None]
+    out = {
+        "means": params["means"][rows, idx],
+        "variances": params["variances"][rows, idx],
+        "transition": params["transition"][rows[:, :, None], idx[:, :, None], idx[:, None, :]],
+    }
+    return out, [a[rows[:, :, None], np.arange(a.shape[1])[None, :, None], idx[:, None, :]] for a in arrays]
+
+
+class BatchMarkovVol:
+    def __init__(self, k=2, max_iter=100, tol=1e-5, em_iter=5):
+        if k < 2:
+            raise ValueError("k must be at least 2")
+        self.k = int(k)
+        self.max_iter = int(max_iter)
+        self.tol = float(tol)
+        self.em_iter = int(em_iter)
+        self.params = None
+        self.loglik = None
+        self.n_iter = 0
+
+    def _frame(self, data):
+        if isinstance(data, pd.Series):
+            return data.astype(float).to_frame(), True
+        if isinstance(data, pd.DataFrame):
+            return data.astype(float), False
+        raise TypeError("Input must be a pandas Series or DataFrame")
+
+    def _wrap(self, probs, index):
+        if self._single:
+            return pd.DataFrame(probs[0], index=index, columns=range(self.k))
+        cols = pd.MultiIndex.from_product([self.columns, range(self.k)])
+        return pd.DataFrame(probs.transpose(1, 0, 2).reshape(len(index), -1), index=index, columns=cols)
+
+    def fit(self, data, start_params=None):
+        # statsmodels' scheme: em_iter EM steps, then BFGS on the same
+        # coordinates and tolerance. EM run to convergence is slow on flat
+        # likelihoods and can walk into a regime collapsing onto one tick
+        frame, self._single = self._frame(data)
+        frame = frame.dropna(how="all")
+        self.columns = frame.columns
+        y = frame.to_numpy().T
+        if start_params is None:
+            params = default_start_params(y, self.k)
+        else:
+            params = {key: np.array(v, dtype=float) for key, v in start_params.items()}
+            if params["means"].shape != (y.shape[0], self.k):
+                raise ValueError("start_params do not match the number of series and regimes")
+        floor = 1e-12 * np.nanvar(y, axis=1)[:, None] + 1e-300
+        for _ in range(self.em_iter):
+            filtered, predicted, _ = hamilton_filter(y, params)
+            smoothed, joint = kim_smoother(filtered, predicted, params["transition"], return_joint=True)
+            params = _em_step(y, smoothed, joint, params, floor)
+        theta, self.n_iter = _polish(y, _to_theta(params), self.k, self.max_iter, self.tol)
+        params = _from_theta(theta, self.k)
+        filtered, predicted, ll = hamilton_filter(y, params)
+        smoothed = kim_smoother(filtered, predicted, params["transition"])
+        params, (filtered, smoothed) = _order(params, [filtered, smoothed])
+        self.params = params
+        self.loglik = pd.Series(ll, index=self.columns)
+        self.index = frame.index
+        self._filtered = filtered
+        self._smoothed = smoothed
+        return self
+
+    @property
+    def smoothed_marginal_probabilities(self):
+        return self._wrap(self._smoothed, self.index)
+
+    @property
+    def filtered_marginal_probabilities(self):
+        return self._wrap(self._filtered, self.index)
+
+    def update(self, new_data):
+        if self.params is None:
+            raise ValueError("call fit before update")
+        frame, _ = self._frame(new_data)
+        frame = frame.reindex(columns=self.columns)
+        if len(frame) == 0:
+            return self._wrap(np.empty((len(self.columns), 0, self.k)), frame.index)
+        y = frame.to_numpy().T
+        # filter-only step from the last filtered state; parameters and the
+        # smoothed history are left as they are
+        filtered, _, ll = hamilton_filter(y, self.params, initial=self._filtered[:, -1])
+        self.loglik = self.loglik + ll
+        self._filtered = np.concatenate([self._filtered, filtered], axis=1)
+        self.index = self.index.append(frame.index)
+        self._smoothed = np.concatenate([self._smoothed, np.full_like(filtered, np.nan)], axis=1)
+        return self._wrap(filtered, frame.index)
+
+
+def batch_markov_vol_regimes(data, k=2, start_params=None):
+    return BatchMarkovVol(k).fit(data, start_params).smoothed_marginal_probabilities
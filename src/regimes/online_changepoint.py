@@ -0,0 +1,166 @@
+import pandas as pd
+import numpy as np
+from scipy.special import gammaln, logsumexp
+
+
+MODELS = ("mean", "vol")
+
+
+class OnlineChangepoint:
+    def __init__(self, model="mean", hazard=1 / 250, max_run=200, min_size=5, n_assets=1):
+        if model not in MODELS:
+            raise ValueError("model must be 'mean' or 'vol'")
+        if not 0 < hazard < 1:
+            raise ValueError("hazard must be between 0 and 1")
+        if max_run < 2:
+            raise ValueError("max_run must be at least 2")
+        self.model = model
+        self.hazard = float(hazard)
+        self.max_run = int(max_run)
+        self.min_size = int(min_size)
+        self.n_assets = int(n_assets)
+        a, r = self.n_assets, self.max_run
+        # run-length posterior over a fixed number of slots per asset
+        self._logp = np.full((a, r), -np.inf)
+        self._run = np.zeros((a, r), dtype=np.int64)
+        self._mu = np.zeros((a, r))
+        self._kappa = np.ones((a, r))
+        self._alpha = np.ones((a, r))
+        self._beta = np.ones((a, r))
+        # running moments give the prior of every new run (empirical Bayes)
+        self._n = np.zeros(a, dtype=np.int64)
+        self._mean = np.zeros(a)
+        self._m2 = np.zeros(a)
+        self._last = np.zeros(a, dtype=np.int64)
+        self._cand = np.zeros(a, dtype=np.int64)
+        self._stable = np.zeros(a, dtype=np.int64)
+        self._confirmed = np.zeros(a, dtype=np.int64)
+        self.breaks = [[] for _ in range(a)]
+
+    def _prior(self, ia):
+        n = self._n[ia]
+        var = np.where(n > 1, self._m2[ia] / np.maximum(n - 1, 1), self._mean[ia] ** 2)
+        var = np.maximum(var, 1e-300)
+        mu = self._mean[ia] if self.model == "mean" else np.zeros(ia.size)
+        return mu, np.ones(ia.size), np.ones(ia.size), var
+
+    def _log_predictive(self, ia, x):
+        mu, kappa, alpha, beta = self._mu[ia], self._kappa[ia], self._alpha[ia], self._beta[ia]
+        nu = 2 * alpha
+        if self.model == "mean":
+            s2 = beta * (kappa + 1) / (alpha * kappa)
+            z = x[:, None] - mu
+        else:
+            s2 = beta / alpha
+            z = np.broadcast_to(x[:, None], s2.shape)
+        return (gammaln((nu + 1) / 2) - gammaln(nu / 2) - 0.5 * np.log(nu * np.pi * s2)
+                - (nu + 1) / 2 * np.log1p(z * z / (nu * s2)))
+
+    def _step(self, x):
+        ia = np.flatnonzero(~np.isnan(x))
+        flags = np.zeros(self.n_assets, dtype=bool)
+        if ia.size == 0:
+            return flags
+        x = x[ia]
+        n = self._n[ia] + 1
+        delta = x - self._mean[ia]
+        self._mean[ia] += delta / n
+        self._m2[ia] += delta * (x - self._mean[ia])
+        self._n[ia] = n
+
+        first = ia[n == 1]
+        if first.size:
+            mu0, k0, a0, b0 = self._prior(first)
+            self._logp[first, 0] = 0.0
+            self._run[first, 0] = 0
+            self._mu[first, 0], self._kappa[first, 0] = mu0, k0
+            self._alpha[first, 0], self._beta[first, 0] = a0, b0
+
+        g = self._logp[ia] + self._log_predictive(ia, x)
+        grow = g + np.log1p(-self.hazard)
+        cp = logsumexp(g, axis=1) + np.log(self.hazard)
+
+        # every run grows by x; sufficient statistics of the conjugate priors
+        mu, kappa = self._mu[ia], self._kappa[ia]
+        if self.model == "mean":
+            self._beta[ia] += kappa * (x[:, None] - mu) ** 2 / (2 * (kappa + 1))
+            self._mu[ia] = (kappa * mu + x[:, None]) / (kappa + 1)
+            self._kappa[ia] = kappa + 1
+        else:
+            self._beta[ia] += x[:, None] ** 2 / 2
+        self._alpha[ia] += 0.5
+        self._run[ia] += 1
+
+        # the new run replaces the least likely slot (an empty one if any)
+        slot = np.argmin(grow, axis=1)
+        grow[np.arange(ia.size), slot] = cp
+        grow -= logsumexp(grow, axis=1)[:, None]
+        self._logp[ia] = grow
+        mu0, k0, a0, b0 = self._prior(ia)
+        self._run[ia, slot] = 0
+        self._mu[ia, slot], self._kappa[ia, slot] = mu0, k0
+        self._alpha[ia, slot], self._beta[ia, slot] = a0, b0
+
+        # a break is reported once the MAP run has kept the same start for
+        # min_size ticks; a start the data already covered when the last break
+        # was confirmed revises the list back to that start instead
+        start = n - self._run[ia, np.argmax(grow, axis=1)]
+        stable = np.where(start == self._cand[ia], self._stable[ia] + 1, 1)
+        self._cand[ia] = start
+        self._stable[ia] = stable
+        conf = (stable >= self.min_size) & (start != self._last[ia])
+        revise = conf & (start <= self._confirmed[ia])
+        new = conf & ~revise & (start - self._last[ia] >= self.min_size)
+        for j in np.flatnonzero(revise | new):
+            a, bk = ia[j], self.breaks[ia[j]]
+            if revise[j]:
+                while bk and bk[-1] >= start[j]:
+                    bk.pop()
+                if bk and start[j] - bk[-1] < self.min_size:
+                    bk.pop()
+            if start[j] > 0 and (not bk or start[j] - bk[-1] >= self.min_size):
+                bk.append(int(start[j]))
+            self._last[a] = bk[-1] if bk else 0
+            self._confirmed[a] = n[j]
+            flags[a] = True
+        return flags
+
+    def update(self, x):
+        x = np.atleast_1d(np.asarray(x, dtype=float))
+        if x.shape != (self.n_assets,):
+            raise ValueError("update expects one value per asset")
+        flags = self._step(x)
+        return bool(flags[0]) if self.n_assets == 1 else flags
+
+    def breakpoints(self):
+        # ruptures format: segment ends, closed by the number of observations
+        out = [self.breaks[j] + [int(self._n[j])] for j in range(self.n_assets)]
+        return out[0] if self.n_assets == 1 else out
+
+
+def online_breaks(data, model="mean", hazard=1 / 250, max_run=200, min_size=5):
+    if isinstance(data, pd.Series):
+        x = data.dropna().astype(float).to_numpy()[:, None]
+    elif isinstance(data, pd.DataFrame):
+        x = data.astype(float).to_numpy()
+    else:
+        raise TypeError("Input must be a pandas Series or DataFrame")
+    det = OnlineChangepoint(model, hazard, max_run, min_size, n_assets=x.shape[1])
+    for row in x:
+        det._step(row)
+    bk = det.breakpoints()
+    if isinstance(data, pd.Series):
+        return bk
+    return dict(zip(data.columns, bk))
+
+
+def online_mean_breaks(series, hazard=1 / 250, max_run=200, min_size=5):
+    if not isinstance(series, pd.Series):
+        raise TypeError("Input must be a pandas Series")
+    return online_breaks(series, "mean", hazard, max_run, min_size)
+
+
+def online_volatility_breaks(series, hazard=1 / 250, max_run=200, min_size=5):
+    if not isinstance(series, pd.Series):
+        raise TypeError("Input must be a pandas Series")
+    return online_breaks(series, "vol", hazard, max_run, min_size)
@@ -0,0 +1,115 @@
+import pandas as pd
+import numpy as np
+
+
+class StreamingZScoreRegimes:
+    def __init__(self, window, normalisation="expanding", span=None, threshold=1.0, n_assets=1):
+        if window < 2:
+            raise ValueError("window must be at least 2")
+        if normalisation not in ("expanding", "ewm"):
+            raise ValueError("normalisation must be 'expanding' or 'ewm'")
+        if normalisation == "ewm" and (span is None or span < 1):
+            raise ValueError("span must be at least 1 for ewm normalisation")
+        self.window = int(window)
+        self.normalisation = normalisation
+        self.alpha = None if span is None else 2.0 / (span + 1.0)
+        self.threshold = float(threshold)
+        self.n_assets = int(n_assets)
+        a = self.n_assets
+        # rolling std of the returns, on values shifted by each asset's first tick
+        self._buf = np.zeros((self.window, a))
+        self._pos = np.zeros(a, dtype=np.int64)
+        self._count = np.zeros(a, dtype=np.int64)
+        self._shift = np.full(a, np.nan)
+        self._sum = np.zeros(a)
+        self._sumsq = np.zeros(a)
+        # normalisation statistics of the rolling std
+        self._n = np.zeros(a, dtype=np.int64)
+        self._mean = np.zeros(a)
+        self._m2 = np.zeros(a)
+        self.vol = np.full(a, np.nan)
+        self.zscore = np.full(a, np.nan)
+
+    def _step(self, x):
+        ia = np.flatnonzero(~np.isnan(x))
+        labels = np.full(self.n_assets, np.nan)
+        if ia.size == 0:
+            return labels
+        x = x[ia]
+        shift = self._shift[ia]
+        first = np.isnan(shift)
+        shift[first] = x[first]
+        self._shift[ia] = shift
+        d = x - shift
+        pos = self._pos[ia]
+        full = self._count[ia] == self.window
+        old = np.where(full, self._buf[pos, ia], 0.0)
+        self._buf[pos, ia] = d
+        self._sum[ia] += d - old
+        self._sumsq[ia] += d * d - old * old
+        self._count[ia] = np.minimum(self._count[ia] + 1, self.window)
+        pos = (pos + 1) % self.window
+        self._pos[ia] = pos
+        # exact resum once per lap of the ring keeps rounding drift bounded
+        wrap = ia[pos == 0]
+        if wrap.size:
+            self._sum[wrap] = self._buf[:, wrap].sum(axis=0)
+            self._sumsq[wrap] = (self._buf[:, wrap] ** 2).sum(axis=0)
+
+        ready = ia[self._count[ia] == self.window]
+        if ready.size == 0:
+            return labels
+        w = self.window
+        var = (self._sumsq[ready] - self._sum[ready] ** 2 / w) / (w - 1)
+        v = np.sqrt(np.maximum(var, 0.0))
+        self.vol[ready] = v
+
+        n = self._n[ready] + 1
+        mean = self._mean[ready]
+        m2 = self._m2[ready]
+        delta = v - mean
+        if self.normalisation == "expanding":
+            mean = mean + delta / n
+            m2 = m2 + delta * (v - mean)
+            var_n = np.where(n > 1, m2 / np.maximum(n - 1, 1), np.nan)
+        else:
+            first = n == 1
+            incr = self.alpha * delta
+            mean = np.where(first, v, mean + incr)
+            m2 = np.where(first, 0.0, (1 - self.alpha) * (m2 + delta * incr))
+            var_n = np.where(n > 1, m2, np.nan)
+        self._n[ready] = n
+        self._mean[ready] = mean
+        self._m2[ready] = m2
+        sd = np.sqrt(var_n)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            z = np.where(sd > 0, (v - mean) / sd, np.nan)
+        self.zscore[ready] = z
+        lab = np.where(z > self.threshold, 1.0, np.where(z < -self.threshold, -1.0, 0.0))
+        labels[ready] = np.where(np.isnan(z), np.nan, lab)
+        return labels
+
+    def update(self, x):
+        x = np.atleast_1d(np.asarray(x, dtype=float))
+        if x.shape != (self.n_assets,):
+            raise ValueError("update expects one value per asset")
+        labels = self._step(x)
+        return float(labels[0]) if self.n_assets == 1 else labels
+
+
+def streaming_zscore_regimes(data, window, normalisation="expanding", span=None, threshold=1.0):
+    if isinstance(data, pd.Series):
+        frame = data.astype(float).to_frame()
+    elif isinstance(data, pd.DataFrame):
+        frame = data.astype(float)
+    else:
+        raise TypeError("Input must be a pandas Series or DataFrame")
+    x = frame.to_numpy()
+    clf = StreamingZScoreRegimes(window, normalisation, span, threshold, n_assets=x.shape[1])
+    # the per-tick step is vectorised across assets, so each row costs O(n_assets)
+    out = np.empty_like(x)
+    for t in range(x.shape[0]):
+        out[t] = clf._step(x[t])
+    if isinstance(data, pd.Series):
+        return pd.Series(out[:, 0], index=data.index, name=data.name)
+    return pd.DataFrame(out, index=frame.index, columns=frame.columns)
@@ -0,0 +1,34 @@
+import pandas as pd
+import numpy as np
+
+from src.covariance.factor_cov import FactorCovariance
+from src.simulation.mc_engine import simulation_loading
+from src.simulation.sampling import SAMPLINGS, standard_normals
+
+
+def _pnl(loading, spec, weights, z):
+    k = loading.shape[1]
+    pnl = z[:, :k] @ (loading.T @ weights)
+    if spec is not None:
+        pnl += z[:, k:] @ (spec * weights)
+    return pnl
+
+
+def standard_error_table(cov, weights, sample_sizes, samplings=SAMPLINGS, alpha=0.99, n_reps=20, seed=None, method="cholesky", variance_cutoff=0.99):
+    if not isinstance(cov, (pd.DataFrame, FactorCovariance)):
+        raise TypeError("cov must be a pandas DataFrame or FactorCovariance")
+    if n_reps < 2:
+        raise ValueError("n_reps must be at least 2")
+    w = np.asarray(weights, dtype=float).ravel()
+    if w.shape[0] != cov.shape[0]:
+        raise ValueError("weights length must match cov dimension")
+    loading, spec = simulation_loading(cov, method, variance_cutoff)
+    dim = loading.shape[1] + (0 if spec is None else loading.shape[0])
+    streams = np.random.SeedSequence(seed).spawn(len(samplings))
+    rows = []
+    for sampling, stream in zip(samplings, streams):
+        rngs = [np.random.default_rng(s) for s in stream.spawn(n_reps)]
+        for n in sample_sizes:
+            est = np.array([-np.quantile(_pnl(loading, spec, w, standard_normals(n, dim, sampling, rng)), 1 - alpha) for rng in rngs])
+            rows.append({"sampling": sampling, "n_samples": int(n), "var": est.mean(), "std_error": est.std(ddof=1)})
+    return pd.DataFrame(rows).set_index(["sampling", "n_samples"])
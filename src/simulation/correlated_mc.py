@@ -1,26 +1,60 @@
 import pandas as pd
 import numpy as np
+from src.covariance.factor_cov import FactorCovariance
+from src.simulation.factor_cache import cov_fingerprint, robust_cholesky, default_cache
+from src.simulation.sampling import standard_normals
 
-def cholesky_simulation(cov, n_samples):
+def _pca(c, variance_cutoff):
+    vals, vecs = np.linalg.eigh(c)
+    idx = vals.argsort()[::-1]
+    vals = vals[idx]
+    vecs = vecs[:, idx]
+    cum = np.cumsum(vals) / np.sum(vals)
+    k = np.searchsorted(cum, variance_cutoff) + 1
+    return vecs[:, :k] @ np.diag(np.sqrt(vals[:k]))
+
+def cholesky_loading(cov, repair=None, cache=default_cache):
     if not isinstance(cov, pd.DataFrame):
         raise TypeError("cov must be a pandas DataFrame")
     c = cov.values
-    L = np.linalg.cholesky(c)
-    z = np.random.randn(n_samples, c.shape[0])
-    r = z @ L.T
-    return pd.DataFrame(r, columns=cov.columns)
+    if cache is None:
+        return robust_cholesky(c, repair)
+    key = ("cholesky", repair, cov_fingerprint(c))
+    return cache.lookup(key, lambda: robust_cholesky(c, repair))
 
-def pca_simulation(cov, n_samples, variance_cutoff=0.99):
+def pca_loading(cov, variance_cutoff=0.99, cache=default_cache):
     if not isinstance(cov, pd.DataFrame):
         raise TypeError("cov must be a pandas DataFrame")
     c = cov.values
-    vals, vecs = np.linalg.eigh(c)
-    idx = vals.argsort()[::-1]
-    vals = vals[idx]
-    vecs = vecs[:, idx]
-    cum = np.cumsum(vals) / np.sum(vals)
-    k = np.searchsorted(cum, variance_cutoff) + 1
-    L = vecs[:, :k] @ np.diag(np.sqrt(vals[:k]))
-    z = np.random.randn(n_samples, k)
+    if cache is None:
+        return _pca(c, variance_cutoff)
+    key = ("pca", float(variance_cutoff), cov_fingerprint(c))
+    return cache.lookup(key, lambda: _pca(c, variance_cutoff))
+
+def _normals(n_samples, dim, sampling, seed):
+    if sampling == "plain" and seed is None:
+        return np.random.randn(n_samples, dim)
+    return standard_normals(n_samples, dim, sampling, seed)
+
+def _factor_simulation(cov, n_samples, sampling, seed):
+    if sampling == "plain" and seed is None:
+        return pd.DataFrame(cov.sample(n_samples), columns=cov.columns)
+    k = cov.n_factors
+    z = standard_normals(n_samples, k + cov.shape[0], sampling, seed)
+    return pd.DataFrame(cov.sample(n_samples, z[:, :k], z[:, k:]), columns=cov.columns)
+
+def cholesky_simulation(cov, n_samples, repair=None, sampling="plain", seed=None):
+    if isinstance(cov, FactorCovariance):
+        return _factor_simulation(cov, n_samples, sampling, seed)
+    L = cholesky_loading(cov, repair)
+    z = _normals(n_samples, L.shape[1], sampling, seed)
     r = z @ L.T
-    return pd.DataFrame(r, columns=cov.columns)
\ No newline at end of file
+    return pd.DataFrame(r, columns=cov.columns)
+
+def pca_simulation(cov, n_samples, variance_cutoff=0.99, sampling="plain", seed=None):
+    if isinstance(cov, FactorCovariance):
+        return _factor_simulation(cov, n_samples, sampling, seed)
+    L = pca_loading(cov, variance_cutoff)
+    z = _normals(n_samples, L.shape[1], sampling, seed)
+    r = z @ L.T
+    return pd.DataFrame(r, columns=cov.columns)
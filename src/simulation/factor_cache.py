@@ -0,0 +1,110 @@
+import hashlib
+from collections import OrderedDict
+
+import numpy as np
+
+
+REPAIRS = (None, "jitter", "nearest")
+
+
+def cov_fingerprint(values):
+    c = np.ascontiguousarray(values, dtype=float)
+    h = hashlib.blake2b(digest_size=16)
+    h.update(repr(c.shape).encode())
+    h.update(c.tobytes())
+    return h.hexdigest()
+
+
+def nearest_psd(values, min_eig=0.0):
+    c = np.asarray(values, dtype=float)
+    c = (c + c.T) / 2
+    vals, vecs = np.linalg.eigh(c)
+    out = (vecs * np.clip(vals, min_eig, None)) @ vecs.T
+    return (out + out.T) / 2
+
+
+def jitter_cholesky(values, jitter=1e-10, max_tries=10):
+    c = np.asarray(values, dtype=float)
+    try:
+        return np.linalg.cholesky(c)
+    except np.linalg.LinAlgError:
+        pass
+    # diagonal loading relative to the average variance, growing tenfold per try
+    scale = max(float(np.mean(np.diag(c))), np.finfo(float).tiny)
+    eye = np.eye(c.shape[0])
+    for i in range(max_tries):
+        try:
+            return np.linalg.cholesky(c + jitter * scale * 10 ** i * eye)
+        except np.linalg.LinAlgError:
+            continue
+    raise np.linalg.LinAlgError("matrix is not positive definite even after jitter")
+
+
+def robust_cholesky(values, repair=None):
+    if repair not in REPAIRS:
+        raise ValueError("repair must be None, 'jitter' or 'nearest'")
+    if repair is None:
+        return np.linalg.cholesky(values)
+    if repair == "nearest":
+        try:
+            return np.linalg.cholesky(values)
+        except np.linalg.LinAlgError:
+            values = nearest_psd(values)
+    return jitter_cholesky(values)
+
+
+class FactorizationCache:
+    def __init__(self, max_entries=32, max_bytes=2**28):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        if max_bytes < 0:
+            raise ValueError("max_bytes must be non-negative")
+        self.max_entries = int(max_entries)
+        self.max_bytes = int(max_bytes)
+        self._entries = OrderedDict()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, key):
+        out = self._entries.get(key)
+        if out is not None:
+            self._entries.move_to_end(key)
+        return out
+
+    def put(self, key, value):
+        value = np.array(value, dtype=float)
+        value.flags.writeable = False
+        if key in self._entries:
+            self.nbytes -= self._entries.pop(key).nbytes
+        if value.nbytes > self.max_bytes:
+            return value
+        self._entries[key] = value
+        self.nbytes += value.nbytes
+        while len(self._entries) > self.max_entries or self.nbytes > self.max_bytes:
+            _, old = self._entries.popitem(last=False)
+            self.nbytes -= old.nbytes
+        return value
+
+    def lookup(self, key, compute):
+        out = self.get(key)
+        if out is not None:
+            self.hits += 1
+            return out
+        self.misses += 1
+        return self.put(key, compute())
+
+    def clear(self):
+        self._entries.clear()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+
+
+default_cache = FactorizationCache()
@@ -0,0 +1,43 @@
+import pandas as pd
+import numpy as np
+
+from src.covariance.factor_cov import FactorCovariance
+from src.simulation.correlated_mc import cholesky_loading, pca_loading
+
+
+def simulation_loading(cov, method="cholesky", variance_cutoff=0.99, repair=None):
+    if isinstance(cov, FactorCovariance):
+        return cov.loading_matrix(), np.sqrt(cov.specific_var)
+    if method == "cholesky":
+        return cholesky_loading(cov, repair), None
+    if method == "pca":
+        return pca_loading(cov, variance_cutoff), None
+    raise ValueError("method must be 'cholesky' or 'pca'")
+
+
+def iter_chunks(loading, n_samples, chunk_size=100_000, seed=None, dtype="float64", specific_vol=None):
+    if n_samples < 0:
+        raise ValueError("n_samples must be non-negative")
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    rng = seed if isinstance(seed, np.random.Generator) else np.random.default_rng(seed)
+    dtype = np.dtype(dtype)
+    lt = np.ascontiguousarray(loading.T, dtype=dtype)
+    spec = None if specific_vol is None else np.asarray(specific_vol, dtype=dtype)
+    for start in range(0, n_samples, chunk_size):
+        m = min(chunk_size, n_samples - start)
+        r = rng.standard_normal((m, lt.shape[0]), dtype=dtype) @ lt
+        if spec is not None:
+            r += rng.standard_normal((m, lt.shape[1]), dtype=dtype) * spec
+        yield r
+
+
+def simulate_chunked(cov, n_samples, reducers, chunk_size=100_000, seed=None, dtype="float64", method="cholesky", variance_cutoff=0.99, repair=None):
+    if not isinstance(cov, (pd.DataFrame, FactorCovariance)):
+        raise TypeError("cov must be a pandas DataFrame or FactorCovariance")
+    loading, spec = simulation_loading(cov, method, variance_cutoff, repair)
+    targets = list(reducers.values()) if isinstance(reducers, dict) else list(reducers)
+    for chunk in iter_chunks(loading, n_samples, chunk_size, seed, dtype, spec):
+        for red in targets:
+            red.update(chunk)
+    return reducers
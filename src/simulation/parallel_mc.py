@@ -0,0 +1,82 @@
+import copy
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import pandas as pd
+import numpy as np
+
+from src.covariance.factor_cov import FactorCovariance
+from src.simulation.mc_engine import simulation_loading, iter_chunks
+
+
+def _attach(name):
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Python < 3.13: pool workers share the parent's resource tracker, so
+        # the extra registration is harmless and the parent's unlink clears it
+        return shared_memory.SharedMemory(name=name)
+
+
+def _run_worker(shm_name, shape, dtype, specific_vol, n_samples, seed_seq, chunk_size, reducers):
+    shm = _attach(shm_name)
+    try:
+        # the block holds loading.T; its transpose is the (N x K) view that
+        # iter_chunks transposes straight back, so no worker copies the matrix
+        lt = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+        targets = list(reducers.values()) if isinstance(reducers, dict) else list(reducers)
+        rng = np.random.default_rng(seed_seq)
+        for chunk in iter_chunks(lt.T, n_samples, chunk_size, rng, dtype, specific_vol):
+            for red in targets:
+                red.update(chunk)
+        del lt
+    finally:
+        shm.close()
+    return reducers
+
+
+def _merge_into(base, other):
+    if isinstance(base, dict):
+        for k in base:
+            base[k].merge(other[k])
+    else:
+        for a, b in zip(base, other):
+            a.merge(b)
+    return base
+
+
+def split_samples(n_samples, n_workers):
+    base, extra = divmod(n_samples, n_workers)
+    return [base + (1 if i < extra else 0) for i in range(n_workers)]
+
+
+def parallel_simulate(cov, n_samples, reducers, n_workers=None, chunk_size=100_000, seed=None, dtype="float64", method="cholesky", variance_cutoff=0.99, repair=None):
+    if not isinstance(cov, (pd.DataFrame, FactorCovariance)):
+        raise TypeError("cov must be a pandas DataFrame or FactorCovariance")
+    n_workers = n_workers or os.cpu_count() or 1
+    if n_workers < 1:
+        raise ValueError("n_workers must be at least 1")
+    dtype = np.dtype(dtype)
+    loading, spec = simulation_loading(cov, method, variance_cutoff, repair)
+    lt = np.ascontiguousarray(loading.T, dtype=dtype)
+    streams = np.random.SeedSequence(seed).spawn(n_workers)
+    counts = split_samples(n_samples, n_workers)
+    shm = shared_memory.SharedMemory(create=True, size=max(lt.nbytes, 1))
+    try:
+        np.ndarray(lt.shape, dtype=dtype, buffer=shm.buf)[:] = lt
+        args = [(shm.name, lt.shape, dtype, spec, counts[i], streams[i], chunk_size, copy.deepcopy(reducers)) for i in range(n_workers)]
+        if n_workers == 1:
+            parts = [_run_worker(*args[0])]
+        else:
+            with ProcessPoolExecutor(max_workers=n_workers) as ex:
+                futures = [ex.submit(_run_worker, *a) for a in args]
+                parts = [f.result() for f in futures]
+    finally:
+        shm.close()
+        shm.unlink()
+    # merge in worker order so the result depends only on seed and n_workers
+    out = parts[0]
+    for part in parts[1:]:
+        _merge_into(out, part)
+    return out
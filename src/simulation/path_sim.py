@@ -0,0 +1,62 @@
+import pandas as pd
+import numpy as np
+
+from src.covariance.factor_cov import FactorCovariance
+from src.simulation.mc_engine import simulation_loading, iter_chunks
+
+
+CUMULATIVE = (None, "sum", "compound")
+
+
+def _vol_scale(vol_scale, horizon, columns, dtype):
+    if vol_scale is None:
+        return None
+    if isinstance(vol_scale, pd.DataFrame):
+        s = vol_scale.reindex(columns=columns).to_numpy(dtype=float)
+    elif isinstance(vol_scale, pd.Series):
+        s = vol_scale.to_numpy(dtype=float)[:, None]
+    else:
+        s = np.asarray(vol_scale, dtype=float)
+        if s.ndim == 1:
+            s = s[:, None]
+    if s.ndim != 2 or s.shape[0] != horizon or s.shape[1] not in (1, len(columns)):
+        raise ValueError("vol_scale must have one row per step and one column per asset (or a single column)")
+    if np.isnan(s).any():
+        raise ValueError("vol_scale must not contain NaN")
+    return s.astype(dtype)
+
+
+def iter_paths(loading, n_paths, horizon, chunk_size=10_000, seed=None, dtype="float64", specific_vol=None, vol_scale=None, cumulative="sum"):
+    if horizon < 1:
+        raise ValueError("horizon must be at least 1")
+    if cumulative not in CUMULATIVE:
+        raise ValueError("cumulative must be None, 'sum' or 'compound'")
+    n = loading.shape[0]
+    # draw whole paths per chunk: a single (m*H x K) @ (K x N) product per chunk
+    for flat in iter_chunks(loading, n_paths * horizon, chunk_size * horizon, seed, dtype, specific_vol):
+        r = flat.reshape(-1, horizon, n)
+        if vol_scale is not None:
+            r *= vol_scale
+        if cumulative == "sum":
+            np.cumsum(r, axis=1, out=r)
+        elif cumulative == "compound":
+            r += 1
+            np.cumprod(r, axis=1, out=r)
+            r -= 1
+        yield r
+
+
+def simulate_paths(cov, n_paths, horizon, chunk_size=10_000, seed=None, dtype="float64", method="cholesky", variance_cutoff=0.99, repair=None, vol_scale=None, cumulative="sum"):
+    if not isinstance(cov, (pd.DataFrame, FactorCovariance)):
+        raise TypeError("cov must be a pandas DataFrame or FactorCovariance")
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    dtype = np.dtype(dtype)
+    loading, spec = simulation_loading(cov, method, variance_cutoff, repair)
+    scale = _vol_scale(vol_scale, horizon, cov.columns, dtype)
+    out = np.empty((n_paths, horizon, loading.shape[0]), dtype=dtype)
+    start = 0
+    for r in iter_paths(loading, n_paths, horizon, chunk_size, seed, dtype, spec, scale, cumulative):
+        out[start:start + r.shape[0]] = r
+        start += r.shape[0]
+    return out
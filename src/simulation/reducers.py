@@ -0,0 +1,142 @@
+import numpy as np
+
+
+class Moments:
+    def __init__(self):
+        self.count = 0
+        self.mean = None
+        self._m2 = None
+        self._m3 = None
+        self._m4 = None
+
+    def update(self, x):
+        x = np.asarray(x, dtype=float)
+        if x.shape[0] == 0:
+            return self
+        mean = x.mean(axis=0)
+        d = x - mean
+        d2 = d * d
+        other = Moments()
+        other.count = x.shape[0]
+        other.mean = mean
+        other._m2 = d2.sum(axis=0)
+        other._m3 = (d2 * d).sum(axis=0)
+        other._m4 = (d2 * d2).sum(axis=0)
+        return self.merge(other)
+
+    def merge(self, other):
+        if other.count == 0:
+            return self
+        if self.count == 0:
+            self.count, self.mean = other.count, other.mean.copy()
+            self._m2, self._m3, self._m4 = other._m2.copy(), other._m3.copy(), other._m4.copy()
+            return self
+        # pairwise update of central moments (Pebay, 2008)
+        na, nb = self.count, other.count
+        n = na + nb
+        delta = other.mean - self.mean
+        d2 = delta * delta
+        m2a, m2b, m3a, m3b = self._m2, other._m2, self._m3, other._m3
+        m4 = (self._m4 + other._m4 + d2 * d2 * na * nb * (na * na - na * nb + nb * nb) / n ** 3
+              + 6 * d2 * (na * na * m2b + nb * nb * m2a) / n ** 2 + 4 * delta * (na * m3b - nb * m3a) / n)
+        m3 = m3a + m3b + d2 * delta * na * nb * (na - nb) / n ** 2 + 3 * delta * (na * m2b - nb * m2a) / n
+        self._m2 = m2a + m2b + d2 * na * nb / n
+        self._m3 = m3
+        self._m4 = m4
+        self.mean = self.mean + delta * nb / n
+        self.count = n
+        return self
+
+    @property
+    def var(self):
+        return self._m2 / (self.count - 1)
+
+    @property
+    def std(self):
+        return np.sqrt(self.var)
+
+    @property
+    def skew(self):
+        return np.sqrt(self.count) * self._m3 / self._m2 ** 1.5
+
+    @property
+    def kurtosis(self):
+        return self.count * self._m4 / self._m2 ** 2 - 3.0
+
+
+class QuantileSketch:
+    def __init__(self, compression=1000):
+        if compression < 20:
+            raise ValueError("compression must be at least 20")
+        self.compression = compression
+        self.count = 0
+        self.min = np.inf
+        self.max = -np.inf
+        self._means = np.empty(0)
+        self._weights = np.empty(0)
+
+    def update(self, values):
+        v = np.asarray(values, dtype=float).ravel()
+        v = v[~np.isnan(v)]
+        if v.size == 0:
+            return self
+        self.min = min(self.min, float(v.min()))
+        self.max = max(self.max, float(v.max()))
+        self._compress(np.concatenate([self._means, v]), np.concatenate([self._weights, np.ones(v.size)]))
+        return self
+
+    def merge(self, other):
+        if other.count == 0:
+            return self
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress(np.concatenate([self._means, other._means]), np.concatenate([self._weights, other._weights]))
+        return self
+
+    def _compress(self, means, weights):
+        # t-digest style: centroids are grouped on the arcsine scale, which keeps
+        # clusters small in both tails where VaR-type quantiles are read
+        order = np.argsort(means, kind="stable")
+        means, weights = means[order], weights[order]
+        total = weights.sum()
+        q = (np.cumsum(weights) - weights / 2) / total
+        scale = self.compression / np.pi * np.arcsin(2 * q - 1)
+        bins = np.floor(scale).astype(np.int64)
+        starts = np.flatnonzero(np.r_[True, bins[1:] != bins[:-1]])
+        w = np.add.reduceat(weights, starts)
+        self._means = np.add.reduceat(means * weights, starts) / w
+        self._weights = w
+        self.count = int(round(total))
+
+    def quantile(self, q):
+        if self.count == 0:
+            raise ValueError("sketch is empty")
+        q = np.asarray(q, dtype=float)
+        centers = np.cumsum(self._weights) - self._weights / 2
+        ranks = np.concatenate([[0.0], centers, [self.count]])
+        vals = np.concatenate([[self.min], self._means, [self.max]])
+        out = np.interp(q * self.count, ranks, vals)
+        return float(out) if out.ndim == 0 else out
+
+
+class PortfolioPnL:
+    def __init__(self, weights, compression=1000):
+        self.weights = np.asarray(weights, dtype=float).ravel()
+        self.moments = Moments()
+        self.sketch = QuantileSketch(compression)
+
+    def update(self, chunk):
+        if chunk.shape[1] != self.weights.shape[0]:
+            raise ValueError("weights length must match the number of assets")
+        pnl = chunk @ self.weights.astype(chunk.dtype, copy=False)
+        self.moments.update(pnl)
+        self.sketch.update(pnl)
+        return self
+
+    def merge(self, other):
+        self.moments.merge(other.moments)
+        self.sketch.merge(other.sketch)
+        return self
+
+    def var(self, alpha=0.99):
+        return -self.sketch.quantile(1 - alpha)
@@ -0,0 +1,48 @@
+import warnings
+
+import numpy as np
+from scipy.stats import norm, qmc
+
+
+SAMPLINGS = ("plain", "antithetic", "sobol", "moment_matching")
+
+
+def _antithetic(n_samples, dim, rng):
+    half = rng.standard_normal(((n_samples + 1) // 2, dim))
+    return np.concatenate([half, -half])[:n_samples]
+
+
+def _sobol(n_samples, dim, rng):
+    engine = qmc.Sobol(dim, scramble=True, seed=rng)
+    with warnings.catch_warnings():
+        # sample counts that are not powers of two lose the balance guarantee
+        # but remain far better spread than pseudo-random draws
+        warnings.simplefilter("ignore", UserWarning)
+        u = engine.random(n_samples)
+    eps = np.finfo(float).eps
+    return norm.ppf(np.clip(u, eps, 1 - eps))
+
+
+def _moment_matched(n_samples, dim, rng):
+    if n_samples <= dim:
+        raise ValueError("moment matching needs more samples than dimensions")
+    z = rng.standard_normal((n_samples, dim))
+    z -= z.mean(axis=0)
+    # whiten so the sample covariance is exactly the identity
+    L = np.linalg.cholesky(z.T @ z / (n_samples - 1))
+    return np.linalg.solve(L, z.T).T
+
+
+def standard_normals(n_samples, dim, sampling="plain", seed=None):
+    if sampling not in SAMPLINGS:
+        raise ValueError("sampling must be one of " + ", ".join(SAMPLINGS))
+    if n_samples < 1 or dim < 1:
+        raise ValueError("n_samples and dim must be at least 1")
+    rng = seed if isinstance(seed, np.random.Generator) else np.random.default_rng(seed)
+    if sampling == "antithetic":
+        return _antithetic(n_samples, dim, rng)
+    if sampling == "sobol":
+        return _sobol(n_samples, dim, rng)
+    if sampling == "moment_matching":
+        return _moment_matched(n_samples, dim, rng)
+    return rng.standard_normal((n_samples, dim))
@@ -0,0 +1,236 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+import numpy as np
+from statsmodels.tsa.adfvalues import mackinnonp, mackinnoncrit
+
+KPSS_CRIT = {
+    "c": [0.347, 0.463, 0.574, 0.739],
+    "ct": [0.119, 0.146, 0.176, 0.216],
+}
+KPSS_PVALS = [0.10, 0.05, 0.025, 0.01]
+
+
+def _trend_columns(n, regression):
+    t = np.arange(1, n + 1, dtype=float)
+    cols = {"n": [], "c": [np.ones(n)], "ct": [np.ones(n), t], "ctt": [np.ones(n), t, t * t]}
+    if regression not in cols:
+        raise ValueError("regression must be one of 'c', 'ct', 'ctt', 'n'")
+    return cols[regression]
+
+
+def _adf_design(x, lags, regression):
+    # rows: [trend..., lagged level, dx_{t-1}, ..., dx_{t-lags}] for a (B, N) stack
+    b, n = x.shape
+    dx = np.diff(x, axis=1)
+    m = dx.shape[1] - lags
+    cols = [np.broadcast_to(c, (b, m)) for c in _trend_columns(m, regression)]
+    cols.append(x[:, -m - 1:-1])
+    for j in range(1, lags + 1):
+        cols.append(dx[:, lags - j:lags - j + m])
+    return np.stack(cols, axis=2), dx[:, -m:]
+
+
+def _nested_ols(design, y):
+    # one QR gives the residual sum of squares of every leading-column sub-model
+    q, r = np.linalg.qr(design)
+    qy = np.einsum("bnk,bn->bk", q, y)
+    ssr = np.einsum("bn,bn->b", y, y)[:, None] - np.cumsum(qy * qy, axis=1)
+    return qy, r, np.maximum(ssr, np.finfo(float).tiny)
+
+
+def _adf_stack(x, regression, autolag, maxlag):
+    n = x.shape[1]
+    ntrend = len(regression) if regression != "n" else 0
+    if maxlag is None:
+        maxlag = int(np.ceil(12.0 * np.power(n / 100.0, 1 / 4.0)))
+        maxlag = min(n // 2 - ntrend - 1, maxlag)
+        if maxlag < 0:
+            raise ValueError("sample size is too short to use selected regression component")
+    elif maxlag > n // 2 - ntrend - 1:
+        raise ValueError("maxlag must be less than (nobs/2 - 1 - ntrend)")
+    if autolag is None:
+        usedlag = np.full(x.shape[0], maxlag)
+    else:
+        design, y = _adf_design(x, maxlag, regression)
+        qy, r, ssr = _nested_ols(design, y)
+        m = y.shape[1]
+        start = ntrend + 1
+        k = np.arange(start, start + maxlag + 1)
+        ssr = ssr[:, k - 1]
+        llf = -m / 2.0 * (np.log(2 * np.pi) + np.log(ssr / m) + 1)
+        if autolag == "aic":
+            usedlag = np.argmin(-2 * llf + 2 * k, axis=1)
+        elif autolag == "bic":
+            usedlag = np.argmin(-2 * llf + np.log(m) * k, axis=1)
+        else:
+            tstat = np.abs(qy[:, k - 1]) / np.sqrt(ssr / (m - k))
+            sig = tstat[:, ::-1] >= 1.6448536269514722
+            usedlag = np.where(sig.any(axis=1), maxlag - np.argmax(sig, axis=1), 0)
+    stat = np.empty(x.shape[0])
+    nobs = np.empty(x.shape[0], dtype=int)
+    for lag in np.unique(usedlag):
+        idx = np.flatnonzero(usedlag == lag)
+        design, y = _adf_design(x[idx], int(lag), regression)
+        # move the lagged level last so its t-value comes straight off the QR
+        design = np.concatenate([np.delete(design, ntrend, axis=2), design[:, :, ntrend:ntrend + 1]], axis=2)
+        qy, r, ssr = _nested_ols(design, y)
+        m, kk = design.shape[1], design.shape[2]
+        stat[idx] = qy[:, -1] * np.sign(r[:, -1, -1]) / np.sqrt(ssr[:, -1] / (m - kk))
+        nobs[idx] = m
+    return stat, usedlag, nobs
+
+
+def _adf_rows(columns, regression, autolag, maxlag):
+    rows = {}
+    for n, group in _group_by_length(columns).items():
+        names = [name for name, _ in group]
+        x = np.vstack([v for _, v in group])
+        try:
+            stat, lags, nobs = _adf_stack(x, regression, autolag, maxlag)
+        except (ValueError, np.linalg.LinAlgError) as e:
+            for name in names:
+                rows[name] = {"error": str(e)}
+            continue
+        for i, name in enumerate(names):
+            crit = mackinnoncrit(N=1, regression=regression, nobs=int(nobs[i]))
+            rows[name] = {
+                "statistic": float(stat[i]),
+                "pvalue": float(mackinnonp(stat[i], regression=regression, N=1)),
+                "lags": int(lags[i]),
+                "nobs": int(nobs[i]),
+                "crit_1%": crit[0],
+                "crit_5%": crit[1],
+                "crit_10%": crit[2],
+            }
+    return rows
+
+
+def _kpss_autolag(resids):
+    n = resids.shape[1]
+    covlags = int(np.power(n, 2.0 / 9.0))
+    s0 = np.sum(resids ** 2, axis=1) / n
+    s1 = np.zeros(resids.shape[0])
+    for i in range(1, covlags + 1):
+        prod = np.einsum("bn,bn->b", resids[:, i:], resids[:, :n - i]) / (n / 2.0)
+        s0 += prod
+        s1 += i * prod
+    s_hat = s1 / s0
+    return (1.1447 * np.power(s_hat * s_hat, 1.0 / 3.0) * np.power(n, 1.0 / 3.0)).astype(int)
+
+
+def _kpss_stack(x, regression, nlags):
+    b, n = x.shape
+    if regression == "ct":
+        t = np.column_stack([np.ones(n), np.arange(1, n + 1)])
+        beta = np.linalg.lstsq(t, x.T, rcond=None)[0]
+        resids = x - (t @ beta).T
+    elif regression == "c":
+        resids = x - x.mean(axis=1, keepdims=True)
+    else:
+        raise ValueError("regression must be 'c' or 'ct'")
+    if nlags == "auto":
+        lags = np.minimum(_kpss_autolag(resids), n - 1)
+    elif nlags == "legacy":
+        lags = np.full(b, min(int(np.ceil(12.0 * np.power(n / 100.0, 1 / 4.0))), n - 1))
+    else:
+        if int(nlags) >= n:
+            raise ValueError(f"lags ({nlags}) must be < number of observations ({n})")
+        lags = np.full(b, int(nlags))
+    eta = np.sum(np.cumsum(resids, axis=1) ** 2, axis=1) / n ** 2
+    s_hat = np.sum(resids ** 2, axis=1)
+    for i in range(1, int(lags.max(initial=0)) + 1):
+        w = np.where(i <= lags, 1.0 - i / (lags + 1.0), 0.0)
+        s_hat += 2 * w * np.einsum("bn,bn->b", resids[:, i:], resids[:, :n - i])
+    stat = eta / (s_hat / n)
+    return stat, lags
+
+
+def _kpss_rows(columns, regression, nlags):
+    crit = KPSS_CRIT.get(regression)
+    rows = {}
+    for n, group in _group_by_length(columns).items():
+        names = [name for name, _ in group]
+        try:
+            stat, lags = _kpss_stack(np.vstack([v for _, v in group]), regression, nlags)
+        except (ValueError, np.linalg.LinAlgError) as e:
+            for name in names:
+                rows[name] = {"error": str(e)}
+            continue
+        pvalue = np.interp(stat, crit, KPSS_PVALS)
+        for i, name in enumerate(names):
+            rows[name] = {
+                "statistic": float(stat[i]),
+                "pvalue": float(pvalue[i]),
+                "lags": int(lags[i]),
+                "nobs": n,
+                "crit_10%": crit[0],
+                "crit_5%": crit[1],
+                "crit_2.5%": crit[2],
+                "crit_1%": crit[3],
+            }
+    return rows
+
+
+def _group_by_length(columns):
+    groups = {}
+    for name, v in columns:
+        groups.setdefault(v.shape[0], []).append((name, v))
+    return groups
+
+
+def _columns(data):
+    if not isinstance(data, pd.DataFrame):
+        raise TypeError("Input must be a pandas DataFrame")
+    return [(name, data[name].dropna().astype(float).to_numpy()) for name in data.columns]
+
+
+def _split_constant(columns):
+    constant = {name for name, v in columns if v.size == 0 or v.max() == v.min()}
+    rows = {name: {"error": "Invalid input, x is constant"} for name in constant}
+    return [c for c in columns if c[0] not in constant], rows
+
+
+def _run(fn, columns, args, n_jobs):
+    if n_jobs == 1 or len(columns) < 2:
+        return fn(columns, *args)
+    workers = n_jobs or os.cpu_count() or 1
+    size = int(np.ceil(len(columns) / workers))
+    chunks = [columns[i:i + size] for i in range(0, len(columns), size)]
+    rows = {}
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        for part in ex.map(fn, chunks, *[[a] * len(chunks) for a in args]):
+            rows.update(part)
+    return rows
+
+
+def _table(rows, names):
+    return pd.DataFrame([rows[n] for n in names], index=pd.Index(names, name="series"))
+
+
+def adf_screen(data, autolag="AIC", regression="c", maxlag=None, n_jobs=1):
+    columns = _columns(data)
+    autolag = autolag.lower() if autolag is not None else None
+    if autolag not in ("aic", "bic", "t-stat", None):
+        raise ValueError("autolag must be 'AIC', 'BIC', 't-stat' or None")
+    _trend_columns(1, regression)
+    columns, rows = _split_constant(columns)
+    rows.update(_run(_adf_rows, columns, (regression, autolag, maxlag), n_jobs))
+    return _table(rows, list(data.columns))
+
+
+def kpss_screen(data, regression="c", nlags="auto", n_jobs=1):
+    columns = _columns(data)
+    if regression not in KPSS_CRIT:
+        raise ValueError("regression must be 'c' or 'ct'")
+    columns, rows = _split_constant(columns)
+    rows.update(_run(_kpss_rows, columns, (regression, nlags), n_jobs))
+    return _table(rows, list(data.columns))
+
+
+def stationarity_screen(data, n_jobs=1):
+    return pd.concat(
+        {"adf": adf_screen(data, n_jobs=n_jobs), "kpss": kpss_screen(data, n_jobs=n_jobs)},
+        names=["test", "series"],
+    )
@@ -0,0 +1,145 @@
+import pandas as pd
+import numpy as np
+from statsmodels.tsa.adfvalues import mackinnonp
+
+from src.stationarity.batch_tests import KPSS_CRIT, KPSS_PVALS
+
+
+def _prefix(a):
+    out = np.zeros((a.shape[0] + 1,) + a.shape[1:])
+    np.cumsum(a, axis=0, out=out[1:])
+    return out
+
+
+def _check(series, window):
+    if not isinstance(series, pd.Series):
+        raise TypeError("Input must be a pandas Series")
+    s = series.dropna().astype(float)
+    if window < 4 or window > len(s):
+        raise ValueError("window must be between 4 and the series length")
+    return s
+
+
+def _adf_rows(x, maxlag, regression):
+    # row t regresses dx_t on [trend(t)..., x_{t-1}, dx_{t-1}, ..., dx_{t-maxlag}];
+    # lags before the sample start are zero and never enter a window's leading block
+    n = x.shape[0]
+    dx = np.diff(x)
+    t = np.arange(1, n) / n
+    cols = {"n": [], "c": [np.ones(n - 1)], "ct": [np.ones(n - 1), t], "ctt": [np.ones(n - 1), t, t * t]}
+    if regression not in cols:
+        raise ValueError("regression must be one of 'c', 'ct', 'ctt', 'n'")
+    level = x[:-1] - (x.mean() if regression != "n" else 0.0)
+    lagged = [np.concatenate([np.zeros(j), dx[:-j]]) for j in range(1, maxlag + 1)]
+    return np.column_stack(cols[regression] + [level] + lagged), dx
+
+
+def rolling_adf(series, window, regression="c", autolag="AIC", maxlag=None):
+    s = _check(series, window)
+    x = s.values
+    ntrend = len(regression) if regression != "n" else 0
+    if maxlag is None:
+        maxlag = int(np.ceil(12.0 * np.power(window / 100.0, 1 / 4.0)))
+        maxlag = min(window // 2 - ntrend - 1, maxlag)
+    if maxlag < 0 or maxlag > window // 2 - ntrend - 1:
+        raise ValueError("maxlag must be less than (window/2 - 1 - ntrend)")
+    autolag = autolag.lower() if autolag is not None else None
+    if autolag not in ("aic", "bic", None):
+        raise ValueError("autolag must be 'AIC', 'BIC' or None")
+    z, y = _adf_rows(x, maxlag, regression)
+    zz = _prefix(z[:, :, None] * z[:, None, :])
+    zy = _prefix(z * y[:, None])
+    yy = _prefix(y * y)
+    end = np.arange(window - 1, x.shape[0])
+    first = ntrend + 1
+
+    def sums(lag):
+        k = first + lag
+        lo = end - window + 1 + lag
+        return (zz[end, :k, :k] - zz[lo, :k, :k], zy[end, :k] - zy[lo, :k], yy[end] - yy[lo], window - 1 - lag)
+
+    if autolag is None:
+        usedlag = np.full(end.shape[0], maxlag)
+    else:
+        xx, xy, y2, m = sums(maxlag)
+        chol = np.linalg.cholesky(xx)
+        c = np.linalg.solve(chol, xy[:, :, None])[:, :, 0]
+        k = np.arange(first, first + maxlag + 1)
+        ssr = np.maximum(y2[:, None] - np.cumsum(c * c, axis=1)[:, k - 1], np.finfo(float).tiny)
+        llf = -m / 2.0 * (np.log(2 * np.pi) + np.log(ssr / m) + 1)
+        penalty = 2 * k if autolag == "aic" else np.log(m) * k
+        usedlag = np.argmin(-2 * llf + penalty, axis=1)
+
+    stat = np.empty(end.shape[0])
+    for lag in np.unique(usedlag):
+        idx = np.flatnonzero(usedlag == lag)
+        xx, xy, y2, m = sums(int(lag))
+        xx, xy, y2 = xx[idx], xy[idx], y2[idx]
+        inv = np.linalg.inv(xx)
+        beta = np.einsum("wij,wj->wi", inv, xy)
+        ssr = y2 - np.einsum("wi,wi->w", beta, xy)
+        sigma2 = ssr / (m - xx.shape[1])
+        stat[idx] = beta[:, ntrend] / np.sqrt(sigma2 * inv[:, ntrend, ntrend])
+    pvalue = np.array([mackinnonp(v, regression=regression, N=1) for v in stat])
+    return pd.DataFrame({"statistic": stat, "pvalue": pvalue, "lags": usedlag}, index=s.index[end])
+
+
+def rolling_kpss(series, window, nlags="auto"):
+    s = _check(series, window)
+    x = s.values - s.values.mean()
+    n = x.shape[0]
+    w = window
+    end = np.arange(w - 1, n)
+    start = end - w + 1
+    mean = (_prefix(x)[end + 1] - _prefix(x)[start]) / w
+
+    # partial sums of window residuals from prefix sums of the running total C_j
+    c = np.concatenate([[0.0], np.cumsum(x)])
+    j = np.arange(n + 1)
+    pc, pc2, pjc = _prefix(c), _prefix(c * c), _prefix(j * c)
+    sum_c = pc[end + 2] - pc[start + 1]
+    sum_c2 = pc2[end + 2] - pc2[start + 1]
+    sum_kc = (pjc[end + 2] - pjc[start + 1]) - start * sum_c
+    cs = c[start]
+    sum_d2 = sum_c2 - 2 * cs * sum_c + w * cs * cs
+    sum_kd = sum_kc - cs * w * (w + 1) / 2.0
+    eta = (sum_d2 - 2 * mean * sum_kd + mean * mean * w * (w + 1) * (2 * w + 1) / 6.0) / w ** 2
+
+    px = _prefix(x)
+
+    def gamma(i):
+        if i == 0:
+            px2 = _prefix(x * x)
+            return px2[end + 1] - px2[start] - w * mean * mean
+        pl = _prefix(x[i:] * x[:-i])
+        cross = pl[end - i + 1] - pl[start]
+        lead = px[end + 1] - px[start + i]
+        lag = px[end - i + 1] - px[start]
+        return cross - mean * (lead + lag) + (w - i) * mean * mean
+
+    gammas = [gamma(0)]
+    if nlags == "auto":
+        covlags = int(np.power(w, 2.0 / 9.0))
+        s0 = gammas[0] / w
+        s1 = np.zeros(end.shape[0])
+        for i in range(1, covlags + 1):
+            gammas.append(gamma(i))
+            prod = gammas[i] / (w / 2.0)
+            s0 = s0 + prod
+            s1 = s1 + i * prod
+        ratio = s1 / s0
+        lags = np.minimum((1.1447 * np.power(ratio * ratio, 1.0 / 3.0) * np.power(w, 1.0 / 3.0)).astype(int), w - 1)
+    elif nlags == "legacy":
+        lags = np.full(end.shape[0], min(int(np.ceil(12.0 * np.power(w / 100.0, 1 / 4.0))), w - 1))
+    else:
+        if int(nlags) >= w:
+            raise ValueError(f"lags ({nlags}) must be < window ({w})")
+        lags = np.full(end.shape[0], int(nlags))
+    s_hat = gammas[0].copy()
+    for i in range(1, int(lags.max(initial=0)) + 1):
+        if i >= len(gammas):
+            gammas.append(gamma(i))
+        s_hat += 2 * np.where(i <= lags, 1.0 - i / (lags + 1.0), 0.0) * gammas[i]
+    stat = eta / (s_hat / w)
+    pvalue = np.interp(stat, KPSS_CRIT["c"], KPSS_PVALS)
+    return pd.DataFrame({"statistic": stat, "pvalue": pvalue, "lags": lags}, index=s.index[end])
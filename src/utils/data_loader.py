@@ -1,28 +1,169 @@
+import hashlib
+import json
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
 import numpy as np
 from pathlib import Path
 
-def load_csv(path, parse_dates=True, index_col=None):
+CACHE_VERSION = 1
+
+def _cache_key(p, **params):
+    st = p.stat()
+    h = hashlib.blake2b(digest_size=16)
+    h.update(json.dumps([CACHE_VERSION, str(p.resolve()), st.st_mtime_ns, st.st_size, params], default=str).encode())
+    return h.hexdigest()
+
+def _columnar(df):
+    # plain numeric/datetime frames with string labels go to .npz, the rest to pickle
+    idx = df.index
+    if isinstance(idx, pd.MultiIndex) or getattr(idx.dtype, "tz", None) is not None:
+        return False
+    labels = list(df.columns) + [idx.name]
+    if not all(isinstance(c, str) or c is None for c in labels) or not df.columns.is_unique:
+        return False
+    for dtype in list(df.dtypes) + [idx.dtype]:
+        if not isinstance(dtype, np.dtype):
+            return False
+        if not (np.issubdtype(dtype, np.number) or np.issubdtype(dtype, np.bool_) or np.issubdtype(dtype, np.datetime64)):
+            return False
+    return True
+
+def _write_cache(df, base):
+    base.parent.mkdir(parents=True, exist_ok=True)
+    columnar = _columnar(df)
+    target = base.with_suffix(".npz" if columnar else ".pkl")
+    # a private temp file per writer, so concurrent loads of the same file
+    # each replace the target atomically instead of sharing one temp path
+    with tempfile.NamedTemporaryFile(dir=base.parent, prefix=base.name + ".", suffix=".tmp", delete=False) as f:
+        tmp = f.name
+        try:
+            if columnar:
+                meta = json.dumps({"columns": list(df.columns), "index_name": df.index.name, "range": isinstance(df.index, pd.RangeIndex)})
+                arrays = {f"c{i}": df.iloc[:, i].to_numpy() for i in range(df.shape[1])}
+                np.savez(f, meta=np.array(meta), index=df.index.to_numpy(), **arrays)
+            else:
+                df.to_pickle(f)
+        except BaseException:
+            f.close()
+            os.unlink(tmp)
+            raise
+    os.replace(tmp, target)
+
+def _read_cache(base):
+    npz = base.with_suffix(".npz")
+    if npz.exists():
+        with np.load(npz, allow_pickle=False) as z:
+            meta = json.loads(str(z["meta"]))
+            cols = meta["columns"]
+            data = {c: z[f"c{i}"] for i, c in enumerate(cols)}
+            index = pd.RangeIndex(len(z["index"])) if meta["range"] else pd.Index(z["index"])
+        index.name = meta["index_name"]
+        return pd.DataFrame(data, index=index, columns=cols)
+    pkl = base.with_suffix(".pkl")
+    if pkl.exists():
+        return pd.read_pickle(pkl)
+    return None
+
+def load_csv(path, parse_dates=True, index_col=None, cache_dir=None):
     p = Path(path)
     if not p.exists():
         raise FileNotFoundError(f"File not found: {path}")
-    return pd.read_csv(p, parse_dates=parse_dates, index_col=index_col)
+    cache_dir = cache_dir or os.environ.get("DATA_CACHE_DIR")
+    if not cache_dir:
+        return pd.read_csv(p, parse_dates=parse_dates, index_col=index_col)
+    base = Path(cache_dir) / _cache_key(p, parse_dates=parse_dates, index_col=index_col)
+    try:
+        df = _read_cache(base)
+    except (OSError, ValueError, KeyError):
+        df = None
+    if df is None:
+        df = pd.read_csv(p, parse_dates=parse_dates, index_col=index_col)
+        _write_cache(df, base)
+    return df
 
-def load_returns(path, price_col="Close"):
-    df = load_csv(path, parse_dates=True, index_col=0)
+def load_returns(path, price_col="Close", cache_dir=None):
+    df = load_csv(path, parse_dates=True, index_col=0, cache_dir=cache_dir)
     if price_col not in df.columns:
         raise ValueError(f"{price_col} not in columns")
     s = df[price_col].astype(float)
     r = np.log(s / s.shift(1)).dropna()
     return r
 
-def load_multi_asset_returns(paths, price_col="Close"):
-    data = {}
-    for name, path in paths.items():
-        r = load_returns(path, price_col=price_col)
-        data[name] = r
-    df = pd.DataFrame(data).dropna()
-    return df
+def load_multi_asset_returns(paths, price_col="Close", n_jobs=None, cache_dir=None):
+    names = list(paths)
+    with ThreadPoolExecutor(max_workers=n_jobs) as ex:
+        series = list(ex.map(lambda n: load_returns(paths[n], price_col=price_col, cache_dir=cache_dir), names))
+    if not series:
+        return pd.DataFrame()
+    # build the joint index once and stack the aligned values, rather than
+    # growing a frame column by column
+    index = series[0].index
+    for s in series[1:]:
+        if not s.index.equals(index):
+            index = index.union(s.index)
+    values = np.column_stack([s.to_numpy() if s.index.equals(index) else s.reindex(index).to_numpy() for s in series])
+    df = pd.DataFrame(values, index=index, columns=names)
+    return df.dropna()
+
+def iter_returns(path, price_col="Close", chunk_size=100_000):
+    p = Path(path)
+    if not p.exists():
+        raise FileNotFoundError(f"File not found: {path}")
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    header = pd.read_csv(p, nrows=0).columns
+    if price_col not in header:
+        raise ValueError(f"{price_col} not in columns")
+    last = None
+    reader = pd.read_csv(p, usecols=[header[0], price_col], index_col=0, parse_dates=True, chunksize=chunk_size)
+    for chunk in reader:
+        s = chunk[price_col].astype(float)
+        # the previous chunk's last price makes the first return of this one
+        prev = s.shift(1)
+        if last is not None and len(s):
+            prev.iloc[0] = last
+        if len(s):
+            last = s.iloc[-1]
+        r = np.log(s / prev).dropna()
+        if len(r):
+            yield r
+
+def iter_multi_asset_returns(paths, price_col="Close", chunk_size=100_000):
+    names = list(paths)
+    if not names:
+        return
+    iters = {n: iter_returns(paths[n], price_col=price_col, chunk_size=chunk_size) for n in names}
+    buffers = {n: None for n in names}
+    open_ = set(names)
+    pending, n_pending = [], 0
+    while True:
+        for n in names:
+            if n in open_ and (buffers[n] is None or len(buffers[n]) == 0):
+                buffers[n] = next(iters[n], None)
+                if buffers[n] is None:
+                    open_.discard(n)
+        if any(buffers[n] is None or len(buffers[n]) == 0 for n in names):
+            break
+        # rows up to the earliest buffered end are complete in every open file
+        mark = min((buffers[n].index[-1] for n in open_), default=None)
+        cut = {}
+        for n in names:
+            k = len(buffers[n]) if mark is None else buffers[n].index.searchsorted(mark, side="right")
+            cut[n] = buffers[n].iloc[:k]
+            buffers[n] = buffers[n].iloc[k:]
+        block = pd.DataFrame(cut).dropna()
+        if len(block):
+            pending.append(block)
+            n_pending += len(block)
+        while n_pending >= chunk_size:
+            joined = pd.concat(pending)
+            yield joined.iloc[:chunk_size]
+            rest = joined.iloc[chunk_size:]
+            pending, n_pending = [rest], len(rest)
+    if n_pending:
+        yield pd.concat(pending)
 
 def ensure_datetime_index(df):
     if not isinstance(df.index, pd.DatetimeIndex):
@@ -31,4 +172,4 @@ def ensure_datetime_index(df):
 
 def align_series(series_list):
     df = pd.concat(series_list, axis=1).dropna()
-    return df
\ No newline at end of file
+    return df
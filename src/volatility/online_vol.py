@@ -0,0 +1,125 @@
+import numpy as np
+
+
+class _KahanSum:
+    def __init__(self):
+        self.total = 0.0
+        self.comp = 0.0
+
+    def add(self, x):
+        y = x - self.comp
+        t = self.total + y
+        self.comp = (t - self.total) - y
+        self.total = t
+
+    def reset(self):
+        self.total = 0.0
+        self.comp = 0.0
+
+
+class _RingBuffer:
+    def __init__(self, window):
+        if window < 1:
+            raise ValueError("window must be at least 1")
+        self.window = int(window)
+        self.buf = np.zeros(self.window)
+        self.pos = 0
+        self.count = 0
+
+    def push(self, x):
+        old = self.buf[self.pos] if self.count == self.window else None
+        self.buf[self.pos] = x
+        self.pos = (self.pos + 1) % self.window
+        if self.count < self.window:
+            self.count += 1
+        return old
+
+    def full(self):
+        return self.count == self.window
+
+
+class _OnlineEstimator:
+    def update(self, x):
+        x = float(x)
+        if np.isnan(x):
+            return self.value
+        self._update(x)
+        return self.value
+
+    def update_batch(self, values):
+        v = np.asarray(values, dtype=float).ravel()
+        out = np.empty(v.shape[0])
+        for i in range(v.shape[0]):
+            out[i] = self.update(v[i])
+        return out
+
+
+class OnlineRollingStd(_OnlineEstimator):
+    def __init__(self, window):
+        self._ring = _RingBuffer(window)
+        self._shift = None
+        self._sum = _KahanSum()
+        self._sumsq = _KahanSum()
+        self.value = np.nan
+
+    def _update(self, x):
+        if self._shift is None:
+            self._shift = x
+        d = x - self._shift
+        old = self._ring.push(d)
+        self._sum.add(d)
+        self._sumsq.add(d * d)
+        if old is not None:
+            self._sum.add(-old)
+            self._sumsq.add(-old * old)
+        n = self._ring.count
+        if self._ring.full() and n > 1:
+            var = (self._sumsq.total - self._sum.total ** 2 / n) / (n - 1)
+            self.value = float(np.sqrt(max(var, 0.0)))
+
+
+class OnlineEWMAVol(_OnlineEstimator):
+    def __init__(self, span):
+        if span < 1:
+            raise ValueError("span must be at least 1")
+        self.alpha = 2.0 / (span + 1.0)
+        self._mean = None
+        self._cov = 0.0
+        self._sum_wt = 1.0
+        self._sum_wt2 = 1.0
+        self.value = np.nan
+
+    def _update(self, x):
+        if self._mean is None:
+            self._mean = x
+            return
+        decay = 1.0 - self.alpha
+        old_wt = decay
+        sum_wt = self._sum_wt * decay
+        sum_wt2 = self._sum_wt2 * decay * decay
+        old_mean = self._mean
+        if old_mean != x:
+            self._mean = (old_wt * old_mean + self.alpha * x) / (old_wt + self.alpha)
+        m = self._mean
+        self._cov = (old_wt * (self._cov + (old_mean - m) ** 2) + self.alpha * (x - m) ** 2) / (old_wt + self.alpha)
+        total = old_wt + self.alpha
+        self._sum_wt = (sum_wt + self.alpha) / total
+        self._sum_wt2 = (sum_wt2 + self.alpha * self.alpha) / (total * total)
+        num = self._sum_wt * self._sum_wt
+        den = num - self._sum_wt2
+        self.value = float(np.sqrt(num / den * self._cov)) if den > 0 else np.nan
+
+
+class OnlineRealizedVol(_OnlineEstimator):
+    def __init__(self, window):
+        self._ring = _RingBuffer(window)
+        self._sumsq = _KahanSum()
+        self.value = np.nan
+
+    def _update(self, x):
+        old = self._ring.push(x)
+        self._sumsq.add(x * x)
+        if old is not None:
+            self._sumsq.add(-old * old)
+        if self._ring.full():
+            self.value = float(np.sqrt(max(self._sumsq.total, 0.0)))
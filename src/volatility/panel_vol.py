@@ -0,0 +1,121 @@
+import pandas as pd
+import numpy as np
+from scipy.signal import lfilter
+
+
+def _as_panel(returns):
+    if isinstance(returns, pd.DataFrame):
+        return returns.to_numpy(dtype=float), returns.index, returns.columns
+    if isinstance(returns, np.ndarray):
+        if returns.ndim != 2:
+            raise ValueError("returns must be 2-dimensional")
+        return returns.astype(float, copy=False), None, None
+    raise TypeError("Input must be a pandas DataFrame or 2-D numpy array")
+
+
+def _compress(block):
+    # block is assets x time; shift the valid observations of each gappy row to
+    # the front, which mirrors the per-column dropna of the Series functions
+    valid = ~np.isnan(block)
+    counts = valid.sum(axis=1)
+    live = np.arange(block.shape[1])[None, :] < counts[:, None]
+    gappy = np.flatnonzero(counts < block.shape[1])
+    if gappy.size == 0:
+        return block, gappy, None, live
+    order = np.argsort(~valid[gappy], axis=1, kind="stable")
+    comp = block.copy()
+    comp[gappy] = np.take_along_axis(block[gappy], order, axis=1)
+    return comp, gappy, order, live
+
+
+def _window_sums(x, window):
+    s = np.empty((x.shape[0], x.shape[1] + 1))
+    s[:, 0] = 0.0
+    np.cumsum(x, axis=1, out=s[:, 1:])
+    w = np.empty(x.shape)
+    w[:, :window - 1] = np.nan
+    np.subtract(s[:, window:], s[:, :-window], out=w[:, window - 1:])
+    return w
+
+
+def _masked(comp, live, all_live):
+    return comp.copy() if all_live else np.where(live, comp, 0.0)
+
+
+def _rolling_std_block(comp, live, all_live, window):
+    if window < 2:
+        return np.full(comp.shape, np.nan)
+    x = _masked(comp, live, all_live)
+    x -= (x.sum(axis=1) / np.maximum(live.sum(axis=1), 1))[:, None]
+    if not all_live:
+        x[~live] = 0.0
+    w1 = _window_sums(x, window)
+    np.multiply(x, x, out=x)
+    var = _window_sums(x, window)
+    np.multiply(w1, w1, out=w1)
+    w1 /= window
+    var -= w1
+    var /= window - 1
+    np.maximum(var, 0.0, out=var)
+    return np.sqrt(var, out=var)
+
+
+def _ewma_vol_block(comp, live, all_live, span):
+    alpha = 2.0 / (span + 1.0)
+    decay = 1.0 - alpha
+    out = np.full(comp.shape, np.nan)
+    if comp.shape[1] < 2:
+        return out
+    x = _masked(comp, live, all_live)
+    mean = np.empty_like(x)
+    mean[:, 0] = x[:, 0]
+    mean[:, 1:], _ = lfilter([alpha], [1.0, -decay], x[:, 1:], axis=1, zi=decay * x[:, :1])
+    innov = decay * (mean[:, :-1] - mean[:, 1:]) ** 2 + alpha * (x[:, 1:] - mean[:, 1:]) ** 2
+    cov = lfilter([1.0], [1.0, -decay], innov, axis=1)
+    k = np.arange(1, comp.shape[1])
+    sum_wt2 = decay ** (2 * k) + alpha * alpha * (1 - decay ** (2 * k)) / (1 - decay * decay)
+    out[:, 1:] = np.sqrt(cov / (1.0 - sum_wt2))
+    return out
+
+
+def _realized_vol_block(comp, live, all_live, window):
+    x = _masked(comp, live, all_live)
+    np.multiply(x, x, out=x)
+    w = _window_sums(x, window)
+    np.maximum(w, 0.0, out=w)
+    return np.sqrt(w, out=w)
+
+
+def _panel_apply(returns, kernel, param, block_size):
+    if param < 1:
+        raise ValueError("window must be at least 1")
+    if block_size < 1:
+        raise ValueError("block_size must be at least 1")
+    values, index, columns = _as_panel(returns)
+    out = np.empty(values.shape)
+    for start in range(0, values.shape[1], block_size):
+        block = np.ascontiguousarray(values[:, start:start + block_size].T)
+        comp, gappy, order, live = _compress(block)
+        all_live = order is None
+        res = kernel(comp, live, all_live, param)
+        if not all_live:
+            res[~live] = np.nan
+            dest = np.empty((gappy.size, res.shape[1]))
+            np.put_along_axis(dest, order, res[gappy], axis=1)
+            res[gappy] = dest
+        out[:, start:start + block_size] = res.T
+    if columns is None:
+        return out
+    return pd.DataFrame(out, index=index, columns=columns)
+
+
+def panel_rolling_std(returns, window, block_size=256):
+    return _panel_apply(returns, _rolling_std_block, int(window), block_size)
+
+
+def panel_ewma_vol(returns, span, block_size=256):
+    return _panel_apply(returns, _ewma_vol_block, span, block_size)
+
+
+def panel_realized_vol(returns, window, block_size=256):
+    return _panel_apply(returns, _realized_vol_block, int(window), block_size)
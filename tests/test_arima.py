@@ -1,6 +1,10 @@
 import pandas as pd
+import numpy as np
 import pytest
 from src.arima.arima_model import fit_arima, forecast, arima_diagnostics
+from src.arima.batch_arima import batch_fit_arima, order_grid
+from src.arima.model_cache import ARIMACache, refit_arima
+from src.arima.fast_forecast import arima_state, batch_forecast
 
 def test_fit_arima_model():
     s = pd.Series([0.01, 0.02, -0.01, 0.03, 0.00, 0.01])
@@ -25,4 +29,61 @@ def test_arima_diagnostics_structure():
 
 def test_arima_type_error():
     with pytest.raises(TypeError):
-        fit_arima([1, 2, 3], order=(1, 0, 1))
\ No newline at end of file
+        fit_arima([1, 2, 3], order=(1, 0, 1))
+
+def test_batch_fit_arima_selects_best_order():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(rng.normal(0, 0.01, (120, 2)), columns=["a", "b"])
+    grid = order_grid([0, 1], [0], [0, 1])
+    best, fits = batch_fit_arima(df, grid, criterion="bic", n_jobs=1, return_all=True)
+    assert list(best.index) == ["a", "b"]
+    assert len(fits) == 8
+    for name in df.columns:
+        sub = fits[fits["series"] == name]
+        assert best.loc[name, "bic"] == sub["bic"].min()
+        assert best.loc[name, "order"] in grid
+
+def test_batch_fit_arima_isolates_failures():
+    df = pd.DataFrame({"a": np.random.default_rng(1).normal(0, 0.01, 60), "b": np.nan})
+    best = batch_fit_arima(df, [(1, 0, 0)], n_jobs=2)
+    assert pd.isna(best.loc["a", "error"])
+    assert best.loc["b", "order"] is None
+    assert isinstance(best.loc["b", "error"], str)
+    with pytest.raises(TypeError):
+        batch_fit_arima(df["a"], [(1, 0, 0)])
+    with pytest.raises(ValueError):
+        batch_fit_arima(df, [(1, 0, 0)], criterion="mse")
+
+def test_refit_arima_appends_without_reestimation():
+    s = pd.Series(np.random.default_rng(2).normal(0, 0.01, 150))
+    m = fit_arima(s.iloc[:149], order=(1, 0, 0))
+    m2 = refit_arima(m, s)
+    assert m2.nobs == 150
+    assert np.allclose(m2.params.values, m.params.values)
+    m3 = refit_arima(m, s, reestimate=True)
+    assert m3.nobs == 150
+
+def test_arima_cache_hits_and_eviction():
+    s = pd.Series(np.random.default_rng(3).normal(0, 0.01, 100))
+    cache = ARIMACache(max_entries=2)
+    f1 = cache.forecast("a", s, (1, 0, 0), steps=3)
+    f2 = cache.forecast("a", s, (1, 0, 0), steps=3)
+    assert f1 is f2
+    assert cache.hits == 1 and cache.misses == 1
+    cache.fit("a", pd.concat([s, pd.Series([0.01], index=[100])]), (1, 0, 0))
+    cache.fit("b", s, (1, 0, 0))
+    assert len(cache) == 2
+    assert cache.misses == 3
+    assert cache.get("a", s, (1, 0, 0)) is None
+
+def test_batch_forecast_matches_statsmodels():
+    df = pd.read_csv("data/processed/returns_medium_clean.csv", index_col=0)
+    orders = [(1, 0, 1), (2, 1, 1), (0, 1, 1)]
+    models = [fit_arima(df[c].reset_index(drop=True), order=o) for c, o in zip(df.columns, orders)]
+    mean, conf = batch_forecast([arima_state(m) for m in models], steps=5)
+    assert mean.shape == (3, 5)
+    assert conf.shape == (3, 5, 2)
+    for i, m in enumerate(models):
+        ref_mean, ref_conf = forecast(m, steps=5)
+        assert np.allclose(mean[i], ref_mean.values)
+        assert np.allclose(conf[i], ref_conf.values)
@@ -3,6 +3,10 @@ import numpy as np
 import pytest
 from src.covariance.empirical_cov import empirical_cov, empirical_corr, annualized_cov, annualized_vol
 from src.covariance.shrinkage_methods import ledoit_wolf, oas_shrinkage, diagonal_shrinkage
+from src.covariance.online_cov import OnlineCovariance
+from src.covariance.rolling_cov import rolling_cov_cube, RollingCovCube
+from src.covariance.fast_shrinkage import shrinkage_estimators
+from src.covariance.factor_cov import FactorCovariance
 
 def test_empirical_cov_shape():
     df = pd.DataFrame({
@@ -60,4 +64,84 @@ def test_type_errors():
     with pytest.raises(TypeError):
         oas_shrinkage([1, 2, 3])
     with pytest.raises(TypeError):
-        diagonal_shrinkage([1, 2, 3], alpha=0.5)
\ No newline at end of file
+        diagonal_shrinkage([1, 2, 3], alpha=0.5)
+
+def test_online_covariance_welford_matches_batch():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(rng.normal(0, 0.01, (200, 3)), columns=["a", "b", "c"])
+    df.iloc[7, 1] = np.nan
+    est = OnlineCovariance().update_batch(df.iloc[:50])
+    for i in range(50, 200):
+        est.update(df.iloc[i].values)
+    assert np.allclose(est.cov(), empirical_cov(df))
+    labeled = OnlineCovariance().update_batch(df.iloc[:50])
+    for i in range(50, 200):
+        labeled.update(df.iloc[i][::-1])
+    assert np.allclose(labeled.cov(), est.cov())
+    assert np.allclose(est.corr(), empirical_corr(df))
+    assert np.allclose(est.annualized_cov(), annualized_cov(df))
+    assert np.allclose(est.annualized_vol(), annualized_vol(df))
+
+def test_online_covariance_window_and_ewma():
+    rng = np.random.default_rng(1)
+    df = pd.DataFrame(rng.normal(0, 0.01, (120, 2)), columns=["a", "b"])
+    win = OnlineCovariance(mode="window", window=30).update_batch(df)
+    assert np.allclose(win.cov(), df.iloc[-30:].cov())
+    ew = OnlineCovariance(mode="ewma", span=20).update_batch(df)
+    ref = df.ewm(span=20, adjust=False).cov().iloc[-2:].values
+    assert np.allclose(ew.cov().values, ref)
+    with pytest.raises(ValueError):
+        OnlineCovariance(mode="window")
+
+def test_rolling_cov_cube_matches_window_cov(tmp_path):
+    rng = np.random.default_rng(2)
+    idx = pd.bdate_range("2021-01-01", periods=90)
+    df = pd.DataFrame(rng.normal(0, 0.01, (90, 3)), index=idx, columns=["a", "b", "c"])
+    path = tmp_path / "cube.npy"
+    cube = rolling_cov_cube(df, window=20, path=path, block_size=7, refresh=10)
+    assert len(cube) == 71
+    loaded = RollingCovCube.open(path)
+    assert isinstance(loaded.values, np.memmap)
+    assert list(loaded.columns) == ["a", "b", "c"]
+    for i in (0, 35, 70):
+        assert np.allclose(loaded.cov_at(i), df.iloc[i:i + 20].cov())
+    assert np.allclose(loaded.cov_on(idx[-1]), df.iloc[-20:].cov())
+    small = rolling_cov_cube(df, window=20, dtype="float32")
+    assert small.values.dtype == np.float32
+
+def test_shrinkage_estimators_match_existing():
+    rng = np.random.default_rng(3)
+    df = pd.DataFrame(rng.normal(0, 0.01, (60, 4)), columns=list("abcd"))
+    out = shrinkage_estimators(df, alpha=0.3)
+    assert np.allclose(out["ledoit_wolf"], ledoit_wolf(df))
+    assert np.allclose(out["oas"], oas_shrinkage(df))
+    assert np.allclose(out["diagonal"], diagonal_shrinkage(df, alpha=0.3))
+    assert np.allclose(out["sample"], empirical_cov(df))
+    assert 0 <= out["lw_shrinkage"] <= 1
+    assert 0 <= out["oas_shrinkage"] <= 1
+
+def test_shrinkage_estimators_window_stack():
+    rng = np.random.default_rng(4)
+    windows = rng.normal(0, 0.01, (5, 40, 3))
+    out = shrinkage_estimators(windows)
+    assert out["ledoit_wolf"].shape == (5, 3, 3)
+    assert out["oas_shrinkage"].shape == (5,)
+    ref = ledoit_wolf(pd.DataFrame(windows[2]))
+    assert np.allclose(out["ledoit_wolf"][2], ref.values)
+    with pytest.raises(ValueError):
+        shrinkage_estimators(windows, alpha=2)
+
+def test_factor_covariance_from_returns_and_cov():
+    rng = np.random.default_rng(5)
+    f = rng.normal(0, 0.01, (300, 2))
+    df = pd.DataFrame(f @ rng.normal(size=(2, 6)) + rng.normal(0, 0.002, (300, 6)), columns=list("abcdef"))
+    fc = FactorCovariance.from_returns(df, n_factors=2)
+    assert fc.n_factors == 2
+    assert fc.loadings.shape == (6, 2)
+    dense = fc.to_dense()
+    assert np.allclose(np.diag(dense), np.diag(empirical_cov(df)))
+    assert np.allclose(dense, empirical_cov(df), atol=1e-5)
+    full = FactorCovariance.from_cov(empirical_cov(df), variance_cutoff=1.0)
+    assert np.allclose(full.to_dense(), empirical_cov(df))
+    with pytest.raises(TypeError):
+        FactorCovariance.from_cov([1, 2, 3])
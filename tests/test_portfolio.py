@@ -2,6 +2,10 @@ import pandas as pd
 import numpy as np
 import pytest
 from src.portfolio.portfolio_variance import portfolio_variance, portfolio_volatility, scenario_variance, scenario_volatility
+from src.covariance.factor_cov import FactorCovariance
+from src.portfolio.portfolio_variance import batch_portfolio_variance, batch_portfolio_volatility
+from src.portfolio.risk_engine import parametric_risk, historical_risk, mc_risk
+from src.portfolio.incremental_risk import PortfolioRisk
 
 def test_portfolio_variance_scalar():
     cov = pd.DataFrame([[0.04, 0.01], [0.01, 0.09]])
@@ -49,4 +53,104 @@ def test_type_errors():
     with pytest.raises(TypeError):
         scenario_variance("not a dict", [0.5, 0.5])
     with pytest.raises(TypeError):
-        scenario_volatility("not a dict", [0.5, 0.5])
\ No newline at end of file
+        scenario_volatility("not a dict", [0.5, 0.5])
+
+def test_portfolio_variance_factor_covariance():
+    rng = np.random.default_rng(0)
+    fc = FactorCovariance(rng.normal(size=(5, 2)), np.diag([0.04, 0.01]), np.full(5, 0.002))
+    w = rng.normal(size=5)
+    dense = fc.to_dense()
+    assert np.isclose(portfolio_variance(fc, w), float(w @ dense.values @ w))
+    out = scenario_variance({"base": fc, "dense": dense}, w)
+    assert np.isclose(out["base"], out["dense"])
+    with pytest.raises(ValueError):
+        portfolio_variance(fc, [0.5, 0.5])
+
+def test_batch_portfolio_variance_matches_scenario_loop():
+    rng = np.random.default_rng(0)
+    covs = {}
+    for name in ["base", "stress"]:
+        a = rng.normal(size=(4, 4))
+        covs[name] = pd.DataFrame(a @ a.T / 4)
+    covs["factor"] = FactorCovariance.from_cov(covs["base"], n_factors=2)
+    w = pd.DataFrame(rng.dirichlet(np.ones(4), size=7), index=[f"p{i}" for i in range(7)])
+    grid = batch_portfolio_variance(w, covs, max_block_bytes=64)
+    assert list(grid.columns) == ["base", "stress", "factor"]
+    assert list(grid.index) == list(w.index)
+    for p in w.index:
+        ref = scenario_variance(covs, w.loc[p].values)
+        for name in covs:
+            assert np.isclose(grid.loc[p, name], ref[name])
+    vol = batch_portfolio_volatility(w, covs)
+    assert np.allclose(vol.values, np.sqrt(grid.values))
+
+def test_batch_portfolio_variance_arrays():
+    stack = np.stack([np.eye(3), 2 * np.eye(3)])
+    out = batch_portfolio_variance(np.ones((2, 3)), stack)
+    assert isinstance(out, np.ndarray)
+    assert np.allclose(out, [[3, 6], [3, 6]])
+    with pytest.raises(ValueError):
+        batch_portfolio_variance(np.ones((2, 4)), stack)
+    with pytest.raises(TypeError):
+        batch_portfolio_variance(np.ones(3), [np.eye(3)])
+
+def test_parametric_risk_components_sum():
+    cov = pd.DataFrame([[0.04, 0.01], [0.01, 0.09]], columns=["a", "b"])
+    w = [0.5, 0.5]
+    out = parametric_risk(cov, w, alpha=0.99)
+    sigma = portfolio_volatility(cov, w)
+    assert np.isclose(out["volatility"], sigma)
+    assert np.isclose(out["var"], 2.3263478740 * sigma)
+    assert out["es"] > out["var"]
+    c = out["contributions"]
+    assert list(c.index) == ["a", "b"]
+    assert np.isclose(c["component_var"].sum(), out["var"])
+    assert np.isclose(c["component_es"].sum(), out["es"])
+    fc = FactorCovariance.from_cov(cov, n_factors=1)
+    assert np.isclose(parametric_risk(fc, w)["volatility"] ** 2, portfolio_variance(fc, w))
+
+def test_historical_and_mc_risk_consistent():
+    cov = pd.DataFrame([[0.04, 0.01], [0.01, 0.09]], columns=["a", "b"])
+    w = np.array([0.5, 0.5])
+    rets = pd.DataFrame(np.random.default_rng(0).normal(size=(1000, 2)), columns=["a", "b"])
+    h = historical_risk(rets, w, alpha=0.95)
+    assert np.isclose(h["var"], -np.quantile(rets.values @ w, 0.05))
+    assert np.isclose(h["contributions"]["component_var"].sum(), h["var"])
+    assert np.isclose(h["contributions"]["component_es"].sum(), h["es"])
+    m = mc_risk(cov, w, alpha=0.99, n_samples=100000, chunk_size=7000, seed=3)
+    p = parametric_risk(cov, w, alpha=0.99)
+    assert np.isclose(m["var"], p["var"], rtol=0.05)
+    assert np.isclose(m["es"], p["es"], rtol=0.05)
+    assert np.isclose(m["contributions"]["component_es"].sum(), m["es"])
+    with pytest.raises(ValueError):
+        mc_risk(cov, w, alpha=1.5)
+
+def test_portfolio_risk_what_if_and_commit():
+    cols = ["a", "b", "c"]
+    cov = pd.DataFrame([[0.04, 0.01, 0.0], [0.01, 0.09, 0.02], [0.0, 0.02, 0.05]], index=cols, columns=cols)
+    w = np.array([0.3, 0.5, 0.2])
+    for c in (cov, FactorCovariance.from_cov(cov, n_factors=2)):
+        pr = PortfolioRisk(c, w)
+        assert np.isclose(pr.variance, portfolio_variance(c, w))
+        trade = {"a": 0.1, "c": -0.05}
+        w2 = w + np.array([0.1, 0.0, -0.05])
+        out = pr.what_if(trade)
+        assert np.isclose(out["variance"], portfolio_variance(c, w2))
+        assert np.isclose(pr.variance, portfolio_variance(c, w))
+        pr.commit(pd.Series([0.05, 0.05, -0.05], index=["a", "a", "c"]))
+        assert np.allclose(pr.weights.values, w2)
+        assert np.isclose(pr.variance, portfolio_variance(c, w2))
+        assert np.isclose(pr.volatility, portfolio_volatility(c, w2))
+
+def test_portfolio_risk_batch():
+    cov = pd.DataFrame([[0.04, 0.01], [0.01, 0.09]], index=["a", "b"], columns=["a", "b"])
+    pr = PortfolioRisk(cov, [0.5, 0.5])
+    grid = pd.DataFrame({"b": [0.1, -0.1, 0.0]}, index=["buy", "sell", "hold"])
+    out = pr.what_if_batch(grid)
+    assert list(out.index) == ["buy", "sell", "hold"]
+    assert np.isclose(out.loc["buy", "variance"], portfolio_variance(cov, [0.5, 0.6]))
+    assert np.isclose(out.loc["hold", "change"], 0.0)
+    named = pr.what_if_batch({"x": {"a": 0.1}, "y": {"a": 0.1, "b": -0.1}})
+    assert np.isclose(named.loc["y", "variance"], portfolio_variance(cov, [0.6, 0.4]))
+    with pytest.raises(ValueError):
+        pr.what_if({"z": 0.1})
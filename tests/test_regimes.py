@@ -1,8 +1,13 @@
 import pandas as pd
 import numpy as np
 import pytest
+from statsmodels.tsa.regime_switching.markov_regression import MarkovRegression
 from src.regimes.volatility_regimes import zscore_regimes, markov_vol_regimes
 from src.regimes.structural_breaks import mean_shift_breaks, volatility_breaks
+from src.regimes.streaming_regimes import StreamingZScoreRegimes, streaming_zscore_regimes
+from src.regimes.markov_batch import BatchMarkovVol, batch_markov_vol_regimes, hamilton_filter
+from src.regimes.online_changepoint import OnlineChangepoint, online_breaks, online_mean_breaks, online_volatility_breaks
+from src.regimes.batch_breaks import batch_breaks
 
 def test_zscore_regimes_basic():
     s = pd.Series([0.01, 0.02, -0.01, 0.03, 0.00])
@@ -37,4 +42,146 @@ def test_type_errors():
     with pytest.raises(TypeError):
         mean_shift_breaks([1, 2, 3])
     with pytest.raises(TypeError):
-        volatility_breaks([1, 2, 3], window=2)
\ No newline at end of file
+        volatility_breaks([1, 2, 3], window=2)
+
+def test_streaming_zscore_regimes_matches_batch():
+    rng = np.random.default_rng(0)
+    scale = np.where(np.arange(400) < 200, 0.01, 0.03)
+    df = pd.DataFrame(rng.normal(size=(400, 3)) * scale[:, None], columns=["a", "b", "c"])
+    df.iloc[50:55, 1] = np.nan
+    for normalisation, span in [("expanding", None), ("ewm", 50)]:
+        batch = streaming_zscore_regimes(df, window=10, normalisation=normalisation, span=span)
+        assert batch.shape == df.shape
+        assert batch.iloc[:9].isna().all().all()
+        for col in df.columns:
+            clf = StreamingZScoreRegimes(10, normalisation, span)
+            labels = [clf.update(v) for v in df[col]]
+            assert np.array_equal(np.array(labels), batch[col].values, equal_nan=True)
+        assert batch.stack().dropna().isin([-1, 0, 1]).all()
+    # causal: labels up to t do not change when later data is appended
+    short = streaming_zscore_regimes(df["a"].iloc[:250], window=10)
+    full = streaming_zscore_regimes(df["a"], window=10)
+    assert short.equals(full.iloc[:250])
+    assert (full.iloc[210:260] == 1).mean() > 0.5
+
+def test_streaming_zscore_regimes_vol_matches_rolling_std():
+    s = pd.Series(np.random.default_rng(1).normal(size=100))
+    clf = StreamingZScoreRegimes(window=5)
+    vols = []
+    for v in s:
+        clf.update(v)
+        vols.append(clf.vol[0])
+    assert np.allclose(vols[4:], s.rolling(5).std().values[4:])
+    with pytest.raises(ValueError):
+        StreamingZScoreRegimes(window=5, normalisation="ewm")
+    with pytest.raises(TypeError):
+        streaming_zscore_regimes([1, 2, 3], window=2)
+
+def _switching_returns(rng, n):
+    state = np.zeros(n, dtype=int)
+    for t in range(1, n):
+        state[t] = state[t - 1] if rng.random() < 0.97 else 1 - state[t - 1]
+    return rng.normal(0.0, np.where(state == 0, 0.01, 0.03))
+
+def test_batch_markov_vol_matches_statsmodels():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({"a": _switching_returns(rng, 400), "b": _switching_returns(rng, 400)})
+    probs = batch_markov_vol_regimes(df, k=2)
+    assert list(probs.columns.levels[0]) == ["a", "b"]
+    ref = markov_vol_regimes(df["a"], k=2)
+    assert np.abs(probs["a"].values - ref.values).max() < 1e-6
+    single = batch_markov_vol_regimes(df["a"], k=2)
+    assert np.allclose(single.values, probs["a"].values)
+    assert np.allclose(single.sum(axis=1), 1.0)
+
+def test_batch_markov_vol_warm_start_and_update():
+    rng = np.random.default_rng(1)
+    df = pd.DataFrame({"a": _switching_returns(rng, 400), "b": _switching_returns(rng, 400)})
+    cold = BatchMarkovVol().fit(df.iloc[:380])
+    warm = BatchMarkovVol().fit(df, start_params=cold.params)
+    assert warm.n_iter < BatchMarkovVol().fit(df).n_iter
+    assert (warm.params["variances"][:, 1] > warm.params["variances"][:, 0]).all()
+    new = cold.update(df.iloc[380:])
+    assert new.shape == (20, 4)
+    y = df.to_numpy().T
+    full, _, ll = hamilton_filter(y, cold.params)
+    assert np.allclose(new.values.reshape(20, 2, 2), full[:, 380:].transpose(1, 0, 2))
+    assert np.allclose(cold.loglik.values, ll)
+    assert len(cold.filtered_marginal_probabilities) == 400
+    with pytest.raises(TypeError):
+        batch_markov_vol_regimes([1, 2, 3])
+
+def test_hamilton_filter_survives_outlier():
+    rng = np.random.default_rng(2)
+    df = pd.DataFrame({"a": _switching_returns(rng, 300), "b": _switching_returns(rng, 300)})
+    m = BatchMarkovVol().fit(df)
+    new = m.update(pd.DataFrame({"a": [0.01, 10.0, 0.0], "b": [0.0, 0.01, -0.01]}))
+    assert np.isfinite(new.values).all()
+    assert np.allclose(new["a"].sum(axis=1), 1.0)
+    assert np.isfinite(m.loglik).all()
+    assert new["a"].iloc[1, 1] > 0.99
+
+def test_batch_markov_vol_matches_statsmodels_on_repo_data():
+    df = pd.read_csv("data/processed/returns_medium_clean.csv", index_col=0)
+    m = BatchMarkovVol().fit(df)
+    probs = m.smoothed_marginal_probabilities
+    for col in df.columns:
+        res = MarkovRegression(df[col].values, k_regimes=2, trend="c", switching_variance=True).fit(disp=0)
+        ref = res.smoothed_marginal_probabilities
+        if res.params[4] > res.params[5]:
+            ref = ref[:, ::-1]
+        assert np.isclose(m.loglik[col], res.llf)
+        assert np.abs(probs[col].values - ref).max() < 1e-6
+    # no regime collapses onto a single tick
+    assert (m.params["variances"] > 1e-3 * df.var().values[:, None]).all()
+
+def test_online_breaks_match_pelt_format():
+    rng = np.random.default_rng(0)
+    s = pd.Series(np.r_[rng.normal(0, 1, 300), rng.normal(2, 1, 300), rng.normal(-1, 1, 400)])
+    bk = online_mean_breaks(s)
+    assert bk[-1] == len(s)
+    assert len(bk) == 3
+    assert abs(bk[0] - 300) <= 5 and abs(bk[1] - 600) <= 5
+    vol = pd.Series(np.r_[rng.normal(0, 0.01, 300), rng.normal(0, 0.03, 300)])
+    vb = online_volatility_breaks(vol)
+    assert len(vb) == 2 and abs(vb[0] - 300) <= 5 and vb[-1] == 600
+    assert online_mean_breaks(pd.Series(rng.normal(size=500))) == [500]
+
+def test_online_breaks_multi_asset_matches_single():
+    rng = np.random.default_rng(1)
+    x = np.r_[rng.normal(0, 1, 200), rng.normal(3, 1, 200)]
+    df = pd.DataFrame({"a": x, "b": x[::-1].copy()})
+    df.iloc[10:20, 1] = np.nan
+    out = online_breaks(df)
+    assert out["a"] == online_mean_breaks(df["a"])
+    assert out["b"] == online_mean_breaks(df["b"])
+    det = OnlineChangepoint("mean", max_run=50)
+    flags = [det.update(v) for v in x]
+    assert any(flags)
+    assert det.breakpoints() == det.breaks[0] + [400]
+    assert det._logp.shape == (1, 50)
+    with pytest.raises(ValueError):
+        OnlineChangepoint("l2")
+
+def test_batch_breaks_matches_single_calls():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({c: np.r_[rng.normal(0, 0.01, 60), rng.normal(0.02, 0.03, 60)] for c in ["a", "b"]})
+    df.iloc[3:6, 1] = np.nan
+    pens = [0.001, 0.01, 1.0]
+    mean = batch_breaks(df, pens, kind="mean", n_jobs=1)
+    vol = batch_breaks(df, pens, kind="volatility", window=5, n_jobs=2)
+    assert list(mean.columns) == ["breaks", "n_breaks", "error"]
+    assert mean.shape == (6, 3)
+    for c in df.columns:
+        for p in pens:
+            assert mean.loc[(c, p), "breaks"] == mean_shift_breaks(df[c], penalty=p)
+            assert vol.loc[(c, p), "breaks"] == volatility_breaks(df[c], window=5, penalty=p)
+    assert (mean.xs("a")["n_breaks"].diff().dropna() <= 0).all()
+
+def test_batch_breaks_errors():
+    out = batch_breaks(pd.DataFrame({"x": [1.0]}), [1.0], n_jobs=1)
+    assert out.loc[("x", 1.0), "error"] is not None
+    with pytest.raises(ValueError):
+        batch_breaks(pd.DataFrame({"x": [1.0, 2.0]}), [1.0], kind="trend")
+    with pytest.raises(TypeError):
+        batch_breaks(pd.Series([1.0, 2.0]), [1.0])
@@ -2,6 +2,16 @@ import pandas as pd
 import numpy as np
 import pytest
 from src.simulation.correlated_mc import cholesky_simulation, pca_simulation
+from src.covariance.factor_cov import FactorCovariance
+from src.simulation.mc_engine import simulate_chunked
+from src.simulation.reducers import Moments, QuantileSketch, PortfolioPnL
+from src.simulation.parallel_mc import parallel_simulate, split_samples
+from src.simulation.correlated_mc import cholesky_loading, pca_loading
+from src.simulation.factor_cache import FactorizationCache, cov_fingerprint, nearest_psd
+from src.simulation.path_sim import simulate_paths
+from src.volatility.rolling_vol import ewma_vol
+from src.simulation.sampling import standard_normals
+from src.simulation.convergence import standard_error_table
 
 def test_cholesky_simulation_shape():
     np.random.seed(0)
@@ -23,4 +33,153 @@ def test_type_errors():
     with pytest.raises(TypeError):
         cholesky_simulation([1, 2, 3], n_samples=100)
     with pytest.raises(TypeError):
-        pca_simulation([1, 2, 3], n_samples=100, variance_cutoff=0.95)
\ No newline at end of file
+        pca_simulation([1, 2, 3], n_samples=100, variance_cutoff=0.95)
+
+def test_factor_covariance_simulation():
+    np.random.seed(0)
+    rng = np.random.default_rng(1)
+    fc = FactorCovariance(rng.normal(0, 0.1, (4, 2)), np.eye(2), np.full(4, 0.001), columns=list("abcd"))
+    out = cholesky_simulation(fc, n_samples=20000)
+    assert out.shape == (20000, 4)
+    assert list(out.columns) == list("abcd")
+    assert np.allclose(out.cov().values, fc.to_dense().values, atol=2e-3)
+    assert pca_simulation(fc, n_samples=10).shape == (10, 4)
+
+def test_simulate_chunked_reproducible_and_chunk_invariant():
+    cov = pd.DataFrame([[0.04, 0.01], [0.01, 0.09]], columns=["a", "b"])
+    w = [0.5, 0.5]
+    a = simulate_chunked(cov, 20000, [PortfolioPnL(w), Moments()], chunk_size=3000, seed=7)
+    b = simulate_chunked(cov, 20000, [PortfolioPnL(w), Moments()], chunk_size=3000, seed=7)
+    assert a[0].var(0.99) == b[0].var(0.99)
+    assert a[1].count == 20000
+    assert np.allclose(a[1].var, np.diag(cov.values), rtol=0.05)
+    sigma = np.sqrt(np.asarray(w) @ cov.values @ np.asarray(w))
+    assert np.isclose(a[0].var(0.99), 2.326 * sigma, rtol=0.05)
+
+def test_simulate_chunked_float32_and_pca():
+    cov = pd.DataFrame([[0.04, 0.01], [0.01, 0.09]])
+    out = simulate_chunked(cov, 5000, {"m": Moments()}, chunk_size=1000, seed=1, dtype="float32", method="pca", variance_cutoff=1.0)
+    assert out["m"].count == 5000
+    with pytest.raises(ValueError):
+        simulate_chunked(cov, 10, [Moments()], method="svd")
+
+def test_reducers_merge_matches_single_pass():
+    x = np.random.default_rng(0).normal(size=(4000, 2))
+    m = Moments().update(x[:1500]).merge(Moments().update(x[1500:]))
+    assert np.allclose(m.mean, x.mean(axis=0))
+    assert np.allclose(m.var, x.var(axis=0, ddof=1))
+    s = QuantileSketch().update(x[:1500, 0]).merge(QuantileSketch().update(x[1500:, 0]))
+    assert s.count == 4000
+    assert np.allclose(s.quantile([0.01, 0.5, 0.99]), np.quantile(x[:, 0], [0.01, 0.5, 0.99]), atol=0.05)
+
+def test_parallel_simulate_deterministic_per_worker_count():
+    cov = pd.DataFrame([[0.04, 0.01], [0.01, 0.09]])
+    w = np.array([0.5, 0.5])
+    runs = [parallel_simulate(cov, 20000, {"pnl": PortfolioPnL(w), "m": Moments()}, n_workers=2, chunk_size=3000, seed=11) for _ in range(2)]
+    assert runs[0]["m"].count == 20000
+    assert np.array_equal(runs[0]["m"].mean, runs[1]["m"].mean)
+    assert np.array_equal(runs[0]["m"].var, runs[1]["m"].var)
+    assert runs[0]["pnl"].var(0.95) == runs[1]["pnl"].var(0.95)
+    np.testing.assert_allclose(runs[0]["m"].var, np.diag(cov.values), rtol=0.05)
+
+def test_parallel_simulate_single_worker_and_split():
+    cov = pd.DataFrame([[0.04, 0.01], [0.01, 0.09]])
+    a = parallel_simulate(cov, 5001, [Moments()], n_workers=1, seed=3)
+    b = parallel_simulate(cov, 5001, [Moments()], n_workers=1, seed=3)
+    assert a[0].count == 5001
+    assert np.array_equal(a[0].mean, b[0].mean)
+    ref = simulate_chunked(cov, 5001, [Moments()], seed=np.random.SeedSequence(3).spawn(1)[0])
+    assert np.array_equal(a[0].mean, ref[0].mean) and np.array_equal(a[0].var, ref[0].var)
+    assert split_samples(10, 3) == [4, 3, 3]
+    with pytest.raises(TypeError):
+        parallel_simulate(cov.values, 10, [Moments()])
+
+def test_factorization_cache_hits_and_eviction():
+    cache = FactorizationCache(max_entries=2)
+    cov = pd.DataFrame([[0.04, 0.01], [0.01, 0.09]])
+    a = cholesky_loading(cov, cache=cache)
+    b = cholesky_loading(cov.copy(), cache=cache)
+    assert a is b and cache.hits == 1 and cache.misses == 1
+    np.testing.assert_allclose(a @ a.T, cov.values)
+    assert not a.flags.writeable
+    pca_loading(cov, 0.9, cache=cache)
+    pca_loading(cov * 2, 0.9, cache=cache)
+    assert len(cache) == 2
+    assert ("cholesky", None, cov_fingerprint(cov.values)) not in cache
+    small = FactorizationCache(max_bytes=16)
+    cholesky_loading(cov, cache=small)
+    assert len(small) == 0 and small.nbytes == 0
+
+def test_cholesky_repair_nearly_psd():
+    c = np.array([[1.0, 0.9, 0.7], [0.9, 1.0, 0.95], [0.7, 0.95, 1.0]])
+    vals, vecs = np.linalg.eigh(c)
+    vals[0] = -1e-6
+    cov = pd.DataFrame((vecs * vals) @ vecs.T)
+    with pytest.raises(np.linalg.LinAlgError):
+        cholesky_loading(cov, cache=None)
+    for repair in ("jitter", "nearest"):
+        L = cholesky_loading(cov, repair=repair, cache=FactorizationCache())
+        np.testing.assert_allclose(L @ L.T, cov.values, atol=1e-5)
+    assert np.linalg.eigvalsh(nearest_psd(cov.values)).min() > -1e-12
+    with pytest.raises(ValueError):
+        cholesky_loading(cov, repair="clip")
+
+def test_simulate_paths_cumulative_and_chunk_invariant():
+    cov = pd.DataFrame([[0.04, 0.01], [0.01, 0.09]], columns=["a", "b"])
+    p = simulate_paths(cov, 20000, 5, chunk_size=3000, seed=2)
+    q = simulate_paths(cov, 20000, 5, chunk_size=777, seed=2)
+    assert p.shape == (20000, 5, 2)
+    assert np.array_equal(p, q)
+    np.testing.assert_allclose(p[:, -1].var(axis=0), 5 * np.diag(cov.values), rtol=0.05)
+    steps = simulate_paths(cov, 100, 5, seed=2, cumulative=None)
+    np.testing.assert_allclose(np.cumsum(steps, axis=1), p[:100])
+    comp = simulate_paths(cov, 100, 5, seed=2, cumulative="compound")
+    np.testing.assert_allclose(comp, np.cumprod(1 + steps, axis=1) - 1)
+
+def test_simulate_paths_vol_scale():
+    cov = pd.DataFrame([[0.04, 0.0], [0.0, 0.09]], columns=["a", "b"])
+    rets = pd.Series(np.random.default_rng(0).normal(0, 0.01, 300))
+    vol = ewma_vol(rets, span=20).iloc[-4:]
+    scale = (vol / vol.iloc[0]).to_numpy()
+    base = simulate_paths(cov, 50, 4, seed=3, cumulative=None)
+    scaled = simulate_paths(cov, 50, 4, seed=3, cumulative=None, vol_scale=scale)
+    np.testing.assert_allclose(scaled, base * scale[None, :, None])
+    frame = pd.DataFrame({"b": [1.0, 2.0, 3.0, 4.0], "a": [1.0, 1.0, 1.0, 1.0]})
+    per_asset = simulate_paths(cov, 50, 4, seed=3, cumulative=None, vol_scale=frame)
+    np.testing.assert_allclose(per_asset[:, :, 1], base[:, :, 1] * frame["b"].values)
+    with pytest.raises(ValueError):
+        simulate_paths(cov, 10, 3, vol_scale=scale)
+
+def test_standard_normals_modes():
+    z = standard_normals(1001, 3, "antithetic", seed=0)
+    assert z.shape == (1001, 3)
+    np.testing.assert_allclose(z[:501][:500], -z[501:])
+    m = standard_normals(500, 3, "moment_matching", seed=0)
+    np.testing.assert_allclose(m.mean(axis=0), 0, atol=1e-12)
+    np.testing.assert_allclose(np.cov(m.T), np.eye(3), atol=1e-12)
+    q = standard_normals(1024, 2, "sobol", seed=0)
+    assert np.all(np.isfinite(q))
+    assert abs(q.mean()) < 0.01
+    assert np.array_equal(q, standard_normals(1024, 2, "sobol", seed=0))
+    with pytest.raises(ValueError):
+        standard_normals(10, 2, "halton")
+
+def test_simulators_sampling_modes():
+    cov = pd.DataFrame([[0.04, 0.01], [0.01, 0.09]], columns=["a", "b"])
+    for sampling in ("antithetic", "sobol", "moment_matching"):
+        out = cholesky_simulation(cov, 4096, sampling=sampling, seed=1)
+        assert list(out.columns) == ["a", "b"]
+        np.testing.assert_allclose(out.cov().values, cov.values, atol=5e-3)
+    mm = pca_simulation(cov, 1000, variance_cutoff=1.0, sampling="moment_matching", seed=1)
+    np.testing.assert_allclose(mm.cov().values, cov.values, atol=1e-12)
+    fc = FactorCovariance.from_cov(cov, n_factors=1)
+    assert cholesky_simulation(fc, 64, sampling="sobol", seed=1).shape == (64, 2)
+
+def test_standard_error_table():
+    cov = pd.DataFrame([[0.04, 0.01], [0.01, 0.09]])
+    table = standard_error_table(cov, [0.5, 0.5], [256, 4096], samplings=("plain", "sobol"), n_reps=8, seed=0)
+    assert list(table.columns) == ["var", "std_error"]
+    assert table.shape == (4, 2)
+    se = table["std_error"]
+    assert se.loc[("plain", 4096)] < se.loc[("plain", 256)]
+    assert se.loc[("sobol", 4096)] < se.loc[("plain", 4096)]
@@ -1,7 +1,10 @@
 import pandas as pd
+import numpy as np
 import pytest
 from src.stationarity.adf_test import adf
 from src.stationarity.kpss_test import kpss_test
+from src.stationarity.batch_tests import adf_screen, kpss_screen, stationarity_screen
+from src.stationarity.rolling_tests import rolling_adf, rolling_kpss
 
 def test_adf_output_structure():
     s = pd.Series([0.01, 0.02, -0.01, 0.03, 0.00])
@@ -27,4 +30,59 @@ def test_adf_type_error():
 
 def test_kpss_type_error():
     with pytest.raises(TypeError):
-        kpss_test([1, 2, 3])
\ No newline at end of file
+        kpss_test([1, 2, 3])
+
+def test_adf_screen_matches_adf():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(rng.normal(0, 0.01, (300, 3)), columns=["a", "b", "c"])
+    df["b"] = df["b"].cumsum()
+    df.iloc[:20, 2] = np.nan
+    out = adf_screen(df)
+    for c in df.columns:
+        ref = adf(df[c])
+        assert np.isclose(out.loc[c, "statistic"], ref["statistic"])
+        assert np.isclose(out.loc[c, "pvalue"], ref["pvalue"])
+        assert out.loc[c, "lags"] == ref["lags"]
+        assert out.loc[c, "nobs"] == ref["nobs"]
+        assert np.isclose(out.loc[c, "crit_5%"], ref["critical_values"]["5%"])
+
+def test_kpss_screen_matches_kpss():
+    rng = np.random.default_rng(1)
+    df = pd.DataFrame(rng.normal(0, 0.01, (300, 2)), columns=["a", "b"])
+    df["b"] = df["b"].cumsum()
+    out = kpss_screen(df, regression="ct")
+    for c in df.columns:
+        ref = kpss_test(df[c], regression="ct")
+        assert np.isclose(out.loc[c, "statistic"], ref["statistic"])
+        assert np.isclose(out.loc[c, "pvalue"], ref["pvalue"])
+        assert out.loc[c, "lags"] == ref["lags"]
+
+def test_stationarity_screen_table():
+    df = pd.DataFrame({"a": np.random.default_rng(2).normal(0, 0.01, 100), "flat": 0.5})
+    out = stationarity_screen(df, n_jobs=2)
+    assert set(out.index.get_level_values("test")) == {"adf", "kpss"}
+    assert isinstance(out.loc[("adf", "flat"), "error"], str)
+    with pytest.raises(TypeError):
+        adf_screen(df["a"])
+
+def test_rolling_adf_matches_window_adf():
+    s = pd.Series(np.random.default_rng(3).normal(0, 0.01, 260)).cumsum()
+    out = rolling_adf(s, window=200)
+    assert len(out) == 61
+    for i in (0, 30, 60):
+        ref = adf(s.iloc[i:i + 200])
+        assert np.isclose(out["statistic"].iloc[i], ref["statistic"])
+        assert out["lags"].iloc[i] == ref["lags"]
+    assert out.index[-1] == s.index[-1]
+
+def test_rolling_kpss_matches_window_kpss():
+    s = pd.Series(np.random.default_rng(4).normal(0, 0.01, 160))
+    out = rolling_kpss(s, window=100)
+    for i in (0, 60):
+        ref = kpss_test(s.iloc[i:i + 100])
+        assert np.isclose(out["statistic"].iloc[i], ref["statistic"])
+        assert np.isclose(out["pvalue"].iloc[i], ref["pvalue"])
+    with pytest.raises(ValueError):
+        rolling_kpss(s, window=500)
+    with pytest.raises(TypeError):
+        rolling_adf([1, 2, 3], window=2)
@@ -0,0 +1,81 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+import numpy as np
+import pytest
+from src.utils.data_loader import load_csv, load_returns, load_multi_asset_returns, iter_returns, iter_multi_asset_returns
+from src.covariance.online_cov import OnlineCovariance
+from src.volatility.online_vol import OnlineRollingStd
+
+def _write_prices(path, start, periods, seed):
+    rng = np.random.default_rng(seed)
+    idx = pd.bdate_range(start, periods=periods, name="Date")
+    df = pd.DataFrame({"Close": np.exp(np.cumsum(rng.normal(0, 0.01, periods))), "Volume": rng.integers(0, 100, periods)}, index=idx)
+    df.to_csv(path)
+    return df
+
+def test_load_csv_cache_roundtrip_and_invalidation(tmp_path):
+    src = tmp_path / "a.csv"
+    cache = tmp_path / "cache"
+    _write_prices(src, "2020-01-01", 30, 0)
+    ref = pd.read_csv(src, parse_dates=True, index_col=0)
+    first = load_csv(src, index_col=0, cache_dir=cache)
+    second = load_csv(src, index_col=0, cache_dir=cache)
+    assert first.equals(ref) and second.equals(ref)
+    assert len(os.listdir(cache)) == 1
+    _write_prices(src, "2021-01-01", 10, 1)
+    os.utime(src, ns=(os.stat(src).st_atime_ns, os.stat(src).st_mtime_ns + 10**9))
+    updated = load_csv(src, index_col=0, cache_dir=cache)
+    assert len(updated) == 10
+    assert len(os.listdir(cache)) == 2
+    with pytest.raises(FileNotFoundError):
+        load_csv(tmp_path / "missing.csv", cache_dir=cache)
+
+def test_load_csv_cache_concurrent_writers(tmp_path):
+    src = tmp_path / "a.csv"
+    cache = tmp_path / "cache"
+    _write_prices(src, "2020-01-01", 500, 0)
+    ref = pd.read_csv(src, parse_dates=True, index_col=0)
+    with ThreadPoolExecutor(max_workers=8) as ex:
+        out = list(ex.map(lambda _: load_csv(src, index_col=0, cache_dir=cache), range(16)))
+    assert all(df.equals(ref) for df in out)
+    assert len(os.listdir(cache)) == 1
+
+def test_load_multi_asset_returns_matches_join(tmp_path):
+    paths = {}
+    for i, start in enumerate(["2020-01-01", "2020-01-08", "2020-01-01"]):
+        paths[f"a{i}"] = tmp_path / f"a{i}.csv"
+        _write_prices(paths[f"a{i}"], start, 40, i)
+    ref = pd.DataFrame({k: load_returns(p) for k, p in paths.items()}).dropna()
+    out = load_multi_asset_returns(paths, n_jobs=2, cache_dir=tmp_path / "cache")
+    assert out.equals(ref)
+    assert load_multi_asset_returns(paths, cache_dir=tmp_path / "cache").equals(ref)
+
+def test_iter_returns_carries_last_price(tmp_path):
+    src = tmp_path / "a.csv"
+    df = _write_prices(src, "2020-01-01", 50, 0)
+    df.iloc[10, 0] = np.nan
+    df.to_csv(src)
+    blocks = list(iter_returns(src, chunk_size=7))
+    assert max(len(b) for b in blocks) <= 7
+    assert pd.concat(blocks).equals(load_returns(src))
+    with pytest.raises(ValueError):
+        next(iter_returns(src, price_col="Price"))
+
+def test_iter_multi_asset_returns_feeds_online_estimators(tmp_path):
+    paths = {}
+    for i, (start, n) in enumerate([("2020-01-01", 120), ("2020-01-15", 100), ("2020-01-01", 90)]):
+        paths[f"a{i}"] = tmp_path / f"a{i}.csv"
+        _write_prices(paths[f"a{i}"], start, n, i)
+    ref = load_multi_asset_returns(paths)
+    blocks = list(iter_multi_asset_returns(paths, chunk_size=16))
+    assert all(len(b) == 16 for b in blocks[:-1])
+    assert pd.concat(blocks).equals(ref)
+    cov = OnlineCovariance()
+    vol = OnlineRollingStd(10)
+    for b in blocks:
+        cov.update_batch(b)
+        last = vol.update_batch(b["a0"].values)
+    assert np.allclose(cov.cov().values, ref.cov().values)
+    assert np.isclose(last[-1], ref["a0"].rolling(10).std().iloc[-1])
+    assert list(iter_multi_asset_returns({})) == []
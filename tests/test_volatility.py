@@ -2,6 +2,8 @@ import pandas as pd
 import numpy as np
 import pytest
 from src.volatility.rolling_vol import rolling_std, ewma_vol, realized_vol
+from src.volatility.online_vol import OnlineRollingStd, OnlineEWMAVol, OnlineRealizedVol
+from src.volatility.panel_vol import panel_rolling_std, panel_ewma_vol, panel_realized_vol
 
 def test_rolling_std_basic():
     s = pd.Series([0.01, 0.02, -0.01, 0.03, 0.00])
@@ -30,4 +32,53 @@ def test_type_errors():
     with pytest.raises(TypeError):
         ewma_vol([1, 2, 3], span=3)
     with pytest.raises(TypeError):
-        realized_vol([1, 2, 3], window=2)
\ No newline at end of file
+        realized_vol([1, 2, 3], window=2)
+
+def test_online_estimators_match_batch():
+    s = pd.Series(np.random.default_rng(0).normal(0, 0.01, 300))
+    cases = [
+        (OnlineRollingStd(20), rolling_std(s, window=20)),
+        (OnlineEWMAVol(20), ewma_vol(s, span=20)),
+        (OnlineRealizedVol(20), realized_vol(s, window=20)),
+    ]
+    for est, batch in cases:
+        out = pd.Series(est.update_batch(s.values), index=s.index).dropna()
+        assert np.allclose(out.values, batch.values)
+        assert np.isclose(est.value, batch.iloc[-1])
+
+def test_online_estimator_single_updates():
+    s = pd.Series([0.01, 0.02, np.nan, -0.01, 0.03, 0.00])
+    est = OnlineRollingStd(3)
+    outs = [est.update(x) for x in s]
+    assert np.isnan(outs[0])
+    assert np.isclose(outs[-1], rolling_std(s, window=3).iloc[-1])
+    with pytest.raises(ValueError):
+        OnlineRollingStd(0)
+
+def test_panel_vol_matches_per_column():
+    rng = np.random.default_rng(1)
+    df = pd.DataFrame(rng.normal(0, 0.01, (200, 5)), columns=list("abcde"))
+    df.iloc[[3, 50, 51], 1] = np.nan
+    df.iloc[:30, 4] = np.nan
+    cases = [
+        (panel_rolling_std(df, window=10, block_size=2), rolling_std, 10),
+        (panel_ewma_vol(df, span=10, block_size=2), ewma_vol, 10),
+        (panel_realized_vol(df, window=10, block_size=2), realized_vol, 10),
+    ]
+    for out, fn, param in cases:
+        assert out.shape == df.shape
+        for c in df.columns:
+            ref = fn(df[c], param)
+            got = out[c].dropna()
+            assert got.index.equals(ref.index)
+            assert np.allclose(got.values, ref.values)
+
+def test_panel_vol_ndarray_and_errors():
+    a = np.random.default_rng(2).normal(0, 0.01, (50, 3))
+    out = panel_rolling_std(a, window=5)
+    assert isinstance(out, np.ndarray)
+    assert out.shape == a.shape
+    with pytest.raises(TypeError):
+        panel_ewma_vol(pd.Series([0.01, 0.02]), span=3)
+    with pytest.raises(ValueError):
+        panel_realized_vol(a[:, 0], window=5)